@@ -72,7 +72,7 @@ def render(df, df_raw, selected_year):
             - **Data Processing**: Pandas, NumPy
             - **Visualization**: Plotly, Plotly Express
             - **Machine Learning**: Scikit-learn (Random Forest Classifier)
-            - **Data Storage**: Excel (HR_Analysis_Output.xlsx, engagement/participation data)
+            - **Data Storage**: Excel (employee, attrition, engagement/participation data; workforce tables computed from the employee data)
             
             #### Key Features
             - Interactive year selector (2020-2025)
@@ -0,0 +1,103 @@
+import os
+import tempfile
+
+import streamlit as st
+import pandas as pd
+from excel_cache import CACHE_DIR
+from partitions import concat, partition_index, year_slice, year_token
+
+# -----------------------------
+# Workforce tables computed from the employee data
+# -----------------------------
+# The HR_Analysis_Output sheets the Workforce tab reads are derived here from
+# the canonical employee frame instead of being parsed from the offline
+# workbook.  One groupby over the employee rows counts every combination of
+# the keys the tables use; each table is then a sum over that small count
+# table.  A year-partitioned frame is aggregated one year at a time, cached
+# by year token, so a changed year is the only one counted again.  With
+# ACJ_ANALYSIS_EXPORT=1 the tables are also written back as an xlsx
+# workbook once per dataset version (see export_xlsx).
+
+KEYS = ["Year", "ResignedFlag", "YearJoined", "Tenure", "Age", "Generation", "Gender", "Position/Level"]
+
+# sheet -> (rows, group keys, count column)
+TABLES = {
+    "Tenure Analysis": ("active", ["Year", "YearJoined", "Tenure"], "Count"),
+    "Resignation Trends": ("leavers", ["Year", "YearJoined", "Tenure"], "LeaverCount"),
+    "Headcount Per Year": ("active", ["Year"], "Headcount"),
+    "Age Distribution": ("active", ["Year", "Age", "Generation"], "Count"),
+    "Gender Diversity": ("active", ["Year", "Gender", "Position/Level"], "Count"),
+}
+
+EXPORT = os.environ.get("ACJ_ANALYSIS_EXPORT", "") not in {"", "0"}
+EXPORT_DIR = os.path.join(CACHE_DIR, "exports")
+
+
+def _year_joined(df_raw):
+    joined = df_raw["Year Joined"]
+    if pd.api.types.is_numeric_dtype(joined):
+        return joined
+    return pd.to_datetime(joined, errors="coerce").dt.year
+
+
+def key_counts(df_raw):
+    """Employee-year rows per combination of KEYS (the one pass over the rows; expects the canonical frame)"""
+    keys = df_raw[[key for key in KEYS if key not in {"YearJoined", "Tenure"}]].copy()
+    keys["YearJoined"] = _year_joined(df_raw)
+    # Years since joining as the workbook counts it, not the Data sheet's Tenure column
+    keys["Tenure"] = keys["Year"] - keys["YearJoined"]
+    return keys.groupby(KEYS, dropna=False, observed=True).size().reset_index(name="Count")
+
+
+def _rollup(counts, by, name):
+    return counts.groupby(by, dropna=False, observed=True)["Count"].sum().reset_index(name=name)
+
+
+def build_tables(df_raw):
+    """{sheet: table} for every sheet in TABLES, from one set of key counts"""
+    counts = key_counts(df_raw)
+    rows = {"active": counts[counts["ResignedFlag"] == 0], "leavers": counts[counts["ResignedFlag"] == 1]}
+    return {sheet: _rollup(rows[which], by, name) for sheet, (which, by, name) in TABLES.items()}
+
+
+@st.cache_resource(max_entries=64)
+def _year_tables(token, year, _df_raw):
+    return build_tables(year_slice(_df_raw, year))
+
+
+def analysis_tables(df_raw):
+    """build_tables, assembled from per-year tables cached by year token when the frame has them"""
+    index = partition_index(df_raw)
+    if not index or sum(stop - start for start, stop in index.values()) != len(df_raw):
+        # Not partitioned, or rows without a year
+        return build_tables(df_raw)
+    tokens = {year: year_token(df_raw, year) for year in index}
+    if None in tokens.values():
+        return build_tables(df_raw)
+    per_year = [_year_tables(tokens[year], year, df_raw) for year in sorted(index)]
+    return {sheet: concat([tables[sheet] for tables in per_year]) for sheet in TABLES}
+
+
+def export_xlsx(tables, version, directory=EXPORT_DIR):
+    """Write the tables as an HR_Analysis_Output workbook, once per dataset version; returns its path"""
+    path = os.path.join(directory, f"HR_Analysis_Output-{version[:16]}.xlsx")
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".xlsx")
+    os.close(fd)
+    try:
+        with pd.ExcelWriter(tmp, engine="openpyxl") as writer:
+            for sheet, table in tables.items():
+                table.to_excel(writer, sheet_name=sheet, index=False)
+        os.replace(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+    # Keep only the export of the current version
+    keep = os.path.basename(path)
+    for name in os.listdir(directory):
+        if name != keep and name.startswith("HR_Analysis_Output-") and len(name) == len(keep):
+            os.remove(os.path.join(directory, name))
+    return path
@@ -2,8 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from cache_utils import SUMMARY_FILE, dataset_token, get_summary_table, summary_version
+from figure_cache import plotly_chart
+from hr_cube import build_count_cube, cube_slice, cube_total
+from partitions import year_slice
+from perf import span
+from tabs import select_year
 
-def render(df, df_raw, selected_year, df_attrition=None, summary_file="HR Cleaned Data 01.09.26.xlsx"):
+def render(df, df_raw, df_attrition=None, summary_file=SUMMARY_FILE, cube=None):
     # -----------------------------
     # Executive Summary at the very top
     # -----------------------------
@@ -32,118 +38,83 @@ def render(df, df_raw, selected_year, df_attrition=None, summary_file="HR Cleane
     st.markdown("## 🔄 Attrition and Retention Metrics")
 
     # -----------------------------
-    # Ensure Retention column exists
+    # Headcount/retention counts come from the pre-aggregated count cube
     # -----------------------------
-    def to_resigned_flag(x):
-        s = str(x).strip().upper()
-        return 0 if s == "ACTIVE" else 1
+    if cube is None:
+        cube = build_count_cube(df_raw)
 
-    if "ResignedFlag" not in df_raw.columns:
-        df_raw["ResignedFlag"] = df_raw["Resignee Checking"].apply(to_resigned_flag)
-    if "Retention" not in df_raw.columns:
-        df_raw["Retention"] = 1 - df_raw["ResignedFlag"]
-
-    # Normalize values
-    df_raw["Gender"] = df_raw["Gender"].str.strip().str.capitalize()
-    df_raw["Resignee Checking"] = df_raw["Resignee Checking"].str.strip().str.upper()
+    st.markdown("<style>h2 { margin-bottom: -0.5rem !important; } </style>", unsafe_allow_html=True)
 
     # -----------------------------
-    # Create Year column from Calendar Year
+    # Year selector, metrics and monthly attrition (reruns on its own)
     # -----------------------------
-    if "Year" not in df_raw.columns and "Calendar Year" in df_raw.columns:
-        df_raw["Year"] = pd.to_datetime(df_raw["Calendar Year"]).dt.year
+    _year_sections(df_raw, summary_file, cube)
 
     # -----------------------------
-    # Row 0: Summary Metrics (Net Change fixed to use Summary tab col H)
+    # Row 1: Resigned per Year + Voluntary vs Involuntary
     # -----------------------------
-    summary_year = df_raw[df_raw["Year"] == selected_year]
-
-    total_employees = len(summary_year)
-    resigned = summary_year["ResignedFlag"].sum()
-    retained = summary_year["Retention"].sum()
+    col1, col2 = st.columns(2)
 
-    retention_rate = (retained / total_employees) * 100 if total_employees > 0 else 0
-    attrition_rate = (resigned / total_employees) * 100 if total_employees > 0 else 0
+    with col1:
+        with st.container(border=True), span("attrition", "Resigned per Year"):
+            st.markdown("#### Resigned per Year")
 
-    # Load official Net Change from Summary tab (Column H)
-    net_change_to_show = 0  # default
-    try:
-        summary_df = pd.read_excel(summary_file, sheet_name="Summary")
-        summary_df.columns = summary_df.columns.str.strip()
+            def build():
+                resigned_per_year = cube_slice(cube, "Year", where={"ResignedFlag": 1}, name="Resigned")
         
-        if "Year" in summary_df.columns and "Net Change" in summary_df.columns:
-            # Convert Year to integer, handling both datetime and numeric formats
-            if pd.api.types.is_datetime64_any_dtype(summary_df["Year"]):
-                summary_df["Year"] = summary_df["Year"].dt.year
-            else:
-                summary_df["Year"] = pd.to_numeric(summary_df["Year"], errors="coerce")
-            
-            summary_df["Year"] = summary_df["Year"].astype(int)
-            summary_df["Net Change"] = pd.to_numeric(summary_df["Net Change"], errors="coerce").fillna(0).astype(int)
-            
-            # Create lookup dictionary
-            year_to_net = summary_df.set_index("Year")["Net Change"].to_dict()
-            
-            if selected_year in year_to_net:
-                net_change_to_show = year_to_net[selected_year]
-    except Exception as e:
-        st.warning(f"Could not load Net Change from Summary sheet: {str(e)}")
-        net_change_to_show = 0
-
-    colA, colB, colC, colD, colE = st.columns(5)
-    
-    with colA:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Total Employees</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{total_employees}</div>", unsafe_allow_html=True)
-    
-    with colB:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Resigned</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{resigned}</div>", unsafe_allow_html=True)
-    
-    with colC:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Retention Rate</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{retention_rate:.1f}%</div>", unsafe_allow_html=True)
-    
-    with colD:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Attrition Rate</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{attrition_rate:.1f}%</div>", unsafe_allow_html=True)
-    
-    with colE:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Net Change</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{net_change_to_show}</div>", unsafe_allow_html=True)
+                # Ensure all years 2020-2025 are included
+                all_years = pd.DataFrame({"Year": range(2020, 2026)})
+                resigned_per_year = all_years.merge(resigned_per_year, on="Year", how="left").fillna(0)
+                resigned_per_year["Resigned"] = resigned_per_year["Resigned"].astype(int)
+                resigned_per_year["Year_str"] = resigned_per_year["Year"].astype(str)
 
-    st.markdown("<style>h2 { margin-bottom: -0.5rem !important; } </style>", unsafe_allow_html=True)
+                fig_resigned = px.bar(resigned_per_year, x="Year_str", y="Resigned",
+                                      color_discrete_sequence=["#00008B"])
+                fig_resigned.update_traces(textposition='outside', texttemplate='%{y:.0f}',
+                                           textfont={"size": 14, "color": "black"})
+                fig_resigned.update_xaxes(title_text="Year")
+                fig_resigned.update_yaxes(title_text="Number of Resignations", range=[0, max(resigned_per_year["Resigned"]) * 1.15])
+                fig_resigned.update_layout(
+                    height=280,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 40},
+                    showlegend=False
+                )
+                return fig_resigned
 
-    # -----------------------------
-    # Row 1: Resigned per Year
-    # -----------------------------
-    with st.container(border=True):
-        st.markdown("#### Resigned per Year")
-        resigned_per_year = df_raw.groupby("Year")["ResignedFlag"].sum().reset_index(name="Resigned")
-        
-        # Ensure all years 2020-2025 are included
-        all_years = pd.DataFrame({"Year": range(2020, 2026)})
-        resigned_per_year = all_years.merge(resigned_per_year, on="Year", how="left").fillna(0)
-        resigned_per_year["Resigned"] = resigned_per_year["Resigned"].astype(int)
-        resigned_per_year["Year_str"] = resigned_per_year["Year"].astype(str)
-        
-        fig_resigned = px.bar(resigned_per_year, x="Year_str", y="Resigned",
-                              color_discrete_sequence=["#00008B"])
-        fig_resigned.update_traces(textposition='outside', texttemplate='%{y:.0f}', 
-                                   textfont={"size": 14, "color": "black"})
-        fig_resigned.update_xaxes(title_text="Year")
-        fig_resigned.update_yaxes(title_text="Number of Resignations", range=[0, max(resigned_per_year["Resigned"]) * 1.15])
-        fig_resigned.update_layout(
-            height=280,
-            margin={"l": 20, "r": 20, "t": 20, "b": 40},
-            showlegend=False
-        )
-        st.plotly_chart(fig_resigned, use_container_width=True, key="resigned_per_year")
+            plotly_chart("attrition", "Resigned per Year", None, dataset_token(cube), build,
+                         use_container_width=True, key="resigned_per_year")
+
+    with col2:
+        with st.container(border=True), span("attrition", "Attrition by Voluntary vs Involuntary"):
+            st.markdown("#### Attrition by Voluntary vs Involuntary (2020 – 2025)")
+            if df_attrition is not None:
+                def build():
+                    if "Year" not in df_attrition.columns and "Calendar Year" in df_attrition.columns:
+                        df_attrition["Year"] = pd.to_datetime(df_attrition["Calendar Year"]).dt.year
+                    attrition_df = df_attrition[
+                        (df_attrition["Year"].between(2020, 2025)) &
+                        (df_attrition["Status"].isin(["Voluntary", "Involuntary"]))
+                    ]
+                    attrition_counts = attrition_df.groupby(["Year", "Status"]).size().reset_index(name="Count")
+                    # Standardized colors: Voluntary=Associate/Female, Involuntary=Manager&Up/Male
+                    fig_attrition = px.bar(
+                        attrition_counts, x="Year", y="Count", color="Status", barmode="group", text="Count",
+                        color_discrete_map={"Voluntary": "#6495ED", "Involuntary": "#00008B"}
+                    )
+                    fig_attrition.update_layout(
+                        height=300,
+                        margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                        yaxis={"title": "Attrition Count"},
+                        xaxis={"title": "Year"},
+                        uniformtext_minsize=10,
+                        uniformtext_mode="hide"
+                    )
+                    return fig_attrition
+
+                plotly_chart("attrition", "Attrition by Voluntary vs Involuntary", None, dataset_token(df_attrition), build,
+                             use_container_width=True, key="attrition_by_type")
+            else:
+                st.info("No Voluntary/Involuntary attrition dataset provided yet.")
 
     # -----------------------------
     # Row 2: Retention by Gender + Retention by Generation
@@ -151,175 +122,216 @@ def render(df, df_raw, selected_year, df_attrition=None, summary_file="HR Cleane
     col1, col2 = st.columns(2)
 
     with col1:
-        with st.container(border=True):
+        with st.container(border=True), span("attrition", "Retention by Gender"):
             st.markdown("#### Retention by Gender")
-            retention_gender = df_raw.groupby(["Year", "Gender"])["Retention"].sum().reset_index()
-            retention_rate_df = df_raw.groupby("Year")["Retention"].mean().reset_index()
-            retention_rate_df["RetentionRatePct"] = retention_rate_df["Retention"] * 100
+
+            def build():
+                retention_gender = cube_slice(cube, ["Year", "Gender"], where={"ResignedFlag": 0}, name="Retention")
+                retention_rate_df = cube_slice(cube, "Year", name="Total").merge(
+                    cube_slice(cube, "Year", where={"ResignedFlag": 0}, name="Retained"), on="Year", how="left"
+                ).fillna(0)
+                retention_rate_df["Retention"] = retention_rate_df["Retained"] / retention_rate_df["Total"]
+                retention_rate_df["RetentionRatePct"] = retention_rate_df["Retention"] * 100
             
-            # Standardized gender colors (blue palette - unique shades)
-            gender_colors = {"Female": "#6495ED", "Male": "#00008B"}
+                # Standardized gender colors (blue palette - unique shades)
+                gender_colors = {"Female": "#6495ED", "Male": "#00008B"}
             
-            fig = go.Figure()
-            for gender in retention_gender["Gender"].unique():
-                subset = retention_gender[retention_gender["Gender"] == gender]
-                color = gender_colors.get(gender, "#00008B")
-                fig.add_bar(x=subset["Year"], y=subset["Retention"], name=gender,
-                            marker_color=color, yaxis="y1")
-            fig.add_trace(go.Scatter(x=retention_rate_df["Year"], y=retention_rate_df["RetentionRatePct"],
-                                     mode="lines+markers", name="Retention Rate (%)",
-                                     line={"color": "orange", "width": 3}, yaxis="y2"))
-            fig.update_layout(
-                yaxis={
-                    "title": "Retained Employees (count)",
-                    "side": "left"
-                },
-                yaxis2={
-                    "title": "Retention Rate (%)",
-                    "overlaying": "y",
-                    "side": "right",
-                    "range": [80, 100]
-                },
-                xaxis={"title": "Year"},
-                barmode="group",
-                height=280,
-                margin={"l": 60, "r": 60, "t": 20, "b": 60},
-                legend={"x": 0.5, "y": -0.25, "xanchor": "center", "yanchor": "top", "orientation": "h"}
-            )
-            st.plotly_chart(fig, use_container_width=True, key="retention_by_gender")
+                fig = go.Figure()
+                for gender in retention_gender["Gender"].unique():
+                    subset = retention_gender[retention_gender["Gender"] == gender]
+                    color = gender_colors.get(gender, "#00008B")
+                    fig.add_bar(x=subset["Year"], y=subset["Retention"], name=gender,
+                                marker_color=color, yaxis="y1")
+                fig.add_trace(go.Scatter(x=retention_rate_df["Year"], y=retention_rate_df["RetentionRatePct"],
+                                         mode="lines+markers", name="Retention Rate (%)",
+                                         line={"color": "orange", "width": 3}, yaxis="y2"))
+                fig.update_layout(
+                    yaxis={
+                        "title": "Retained Employees (count)",
+                        "side": "left"
+                    },
+                    yaxis2={
+                        "title": "Retention Rate (%)",
+                        "overlaying": "y",
+                        "side": "right",
+                        "range": [80, 100]
+                    },
+                    xaxis={"title": "Year"},
+                    barmode="group",
+                    height=280,
+                    margin={"l": 60, "r": 60, "t": 20, "b": 60},
+                    legend={"x": 0.5, "y": -0.25, "xanchor": "center", "yanchor": "top", "orientation": "h"}
+                )
+                return fig
+
+            plotly_chart("attrition", "Retention by Gender", None, dataset_token(cube), build,
+                         use_container_width=True, key="retention_by_gender")
 
     with col2:
-        with st.container(border=True):
+        with st.container(border=True), span("attrition", "Retention by Generation"):
             st.markdown("#### Retention by Generation")
-            active_df = df_raw[df_raw["Resignee Checking"] == "ACTIVE"]
-            
-            # Normalize Generation values
-            df_raw["Generation"] = df_raw["Generation"].str.strip().str.title()
-            
-            total_by_year_gen = df_raw[df_raw["Year"].between(2020, 2025)].groupby(["Year", "Generation"]).size().reset_index(name="Total")
-            active_by_year_gen = active_df[active_df["Year"].between(2020, 2025)].groupby(["Year", "Generation"]).size().reset_index(name="Active")
-            retention_df = pd.merge(total_by_year_gen, active_by_year_gen, on=["Year", "Generation"], how="left")
-            retention_df["RetentionRate"] = (retention_df["Active"] / retention_df["Total"]) * 100
+
+            def build():
+                cube_in_range = cube[cube["Year"].between(2020, 2025)]
+                total_by_year_gen = cube_slice(cube_in_range, ["Year", "Generation"], name="Total")
+                active_by_year_gen = cube_slice(cube_in_range, ["Year", "Generation"], where={"ResignedFlag": 0}, name="Active")
+                retention_df = pd.merge(total_by_year_gen, active_by_year_gen, on=["Year", "Generation"], how="left")
+                retention_df["RetentionRate"] = (retention_df["Active"] / retention_df["Total"]) * 100
             
-            # Define generation order (alphabetical)
-            generation_order = ["Baby Boomer", "Gen X", "Gen Z", "Millennial"]
+                # Define generation order (alphabetical)
+                generation_order = ["Baby Boomer", "Gen X", "Gen Z", "Millennial"]
             
-            # Standardized generation colors - unique blue shades
-            generation_colors = {
-                "Gen Z": "#87CEEB",           # Sky Blue
-                "Millennial": "#4169E1",      # Royal Blue
-                "Gen X": "#1E90FF",           # Dodger Blue
-                "Baby Boomer": "#00008B",     # Dark Blue
-                "Boomer": "#00008B"           # Dark Blue (fallback)
-            }
+                # Standardized generation colors - unique blue shades
+                generation_colors = {
+                    "Gen Z": "#87CEEB",           # Sky Blue
+                    "Millennial": "#4169E1",      # Royal Blue
+                    "Gen X": "#1E90FF",           # Dodger Blue
+                    "Baby Boomer": "#00008B",     # Dark Blue
+                    "Boomer": "#00008B"           # Dark Blue (fallback)
+                }
             
-            # Convert Generation to categorical with defined order
-            retention_df["Generation"] = pd.Categorical(retention_df["Generation"], categories=generation_order, ordered=True)
+                # Convert Generation to categorical with defined order
+                retention_df["Generation"] = pd.Categorical(retention_df["Generation"], categories=generation_order, ordered=True)
             
-            fig_retention = px.bar(retention_df, x="Year", y="RetentionRate", color="Generation", barmode="group",
-                                   text=retention_df["RetentionRate"].round(1).astype(str) + "%",
-                                   color_discrete_map=generation_colors,
-                                   category_orders={"Generation": generation_order})
-            fig_retention.update_layout(
-                height=280,
-                margin={"l": 20, "r": 20, "t": 20, "b": 60},
-                yaxis={"title": "Retention Rate (%)"},
-                xaxis={"title": "Year"},
-                uniformtext_minsize=10,
-                uniformtext_mode="hide",
-                legend={"x": 0.5, "y": -0.25, "xanchor": "center", "yanchor": "top", "orientation": "h"}
-            )
-            st.plotly_chart(fig_retention, use_container_width=True, key="retention_by_generation")
+                fig_retention = px.bar(retention_df, x="Year", y="RetentionRate", color="Generation", barmode="group",
+                                       text=retention_df["RetentionRate"].round(1).astype(str) + "%",
+                                       color_discrete_map=generation_colors,
+                                       category_orders={"Generation": generation_order})
+                fig_retention.update_layout(
+                    height=280,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 60},
+                    yaxis={"title": "Retention Rate (%)"},
+                    xaxis={"title": "Year"},
+                    uniformtext_minsize=10,
+                    uniformtext_mode="hide",
+                    legend={"x": 0.5, "y": -0.25, "xanchor": "center", "yanchor": "top", "orientation": "h"}
+                )
+                return fig_retention
+
+            plotly_chart("attrition", "Retention by Generation", None, dataset_token(cube), build,
+                         use_container_width=True, key="retention_by_generation")
 
     # -----------------------------
-    # Row 3: Attrition Analysis
+    # Row 3: Net Talent Gain/Loss (already uses Summary tab Net Change)
     # -----------------------------
-    with st.container(border=True):
-        st.markdown("#### Attrition Analysis")
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.markdown(f"##### Attrition by Month ({selected_year})")
-            attrition_selected = df_raw[(df_raw["Year"] == selected_year) & (df_raw["ResignedFlag"] == 1)].copy()
-            attrition_selected["Month"] = pd.to_datetime(attrition_selected["Resignation Date"]).dt.month_name()
-            monthly_attrition = (
-                attrition_selected.groupby("Month")
-                .size()
-                .reindex([
-                    "January", "February", "March", "April", "May", "June",
-                    "July", "August", "September", "October", "November", "December"
-                ])
-                .reset_index(name="AttritionCount")
-            )
-            fig_monthly = px.bar(
-                monthly_attrition, x="Month", y="AttritionCount", text="AttritionCount",
-                color_discrete_sequence=["#00008B"]
+    with st.container(border=True), span("attrition", "Net Talent Gain/Loss"):
+        st.markdown("#### Net Talent Gain/Loss")
+
+        def build():
+            summary_df = get_summary_table(summary_file, df_raw)
+            net_df = summary_df[["Year", "Joins", "Resignations", "Net Change"]].copy()
+            net_df.rename(columns={"Net Change": "NetChange"}, inplace=True)
+            net_df["Status"] = net_df["NetChange"].apply(lambda x: "Increase" if x > 0 else "Decrease")
+            net_df["Status"] = pd.Categorical(net_df["Status"], categories=["Increase", "Decrease"], ordered=True)
+            net_df["Year"] = net_df["Year"].astype(str)
+
+            color_map = {"Increase": "#2E8B57", "Decrease": "#B22222"}
+            fig_net = px.bar(
+                net_df, x="Year", y="NetChange",
+                text=net_df["NetChange"].apply(lambda x: f"{x:+d}"),
+                color="Status", color_discrete_map=color_map,
+                hover_data={"Joins": True, "Resignations": True, "NetChange": True, "Status": True, "Year": True}
             )
-            fig_monthly.update_layout(
-                height=300,
+            fig_net.update_layout(
+                height=320,
                 margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                yaxis={"title": "Attrition Count"},
-                xaxis={"title": "Month"},
+                yaxis={"title": "Net Change"},
+                xaxis={"title": "Year"},
                 uniformtext_minsize=10,
-                uniformtext_mode="hide",
-                showlegend=False
+                uniformtext_mode="hide"
             )
-            st.plotly_chart(fig_monthly, use_container_width=True, key="attrition_by_month")
+            return fig_net
 
-        with col2:
-            st.markdown("##### Attrition by Voluntary vs Involuntary (2020 – 2025)")
-            if df_attrition is not None:
-                if "Year" not in df_attrition.columns and "Calendar Year" in df_attrition.columns:
-                    df_attrition["Year"] = pd.to_datetime(df_attrition["Calendar Year"]).dt.year
-                attrition_df = df_attrition[
-                    (df_attrition["Year"].between(2020, 2025)) &
-                    (df_attrition["Status"].isin(["Voluntary", "Involuntary"]))
-                ]
-                attrition_counts = attrition_df.groupby(["Year", "Status"]).size().reset_index(name="Count")
-                # Standardized colors: Voluntary=Associate/Female, Involuntary=Manager&Up/Male
-                fig_attrition = px.bar(
-                    attrition_counts, x="Year", y="Count", color="Status", barmode="group", text="Count",
-                    color_discrete_map={"Voluntary": "#6495ED", "Involuntary": "#00008B"}
+        plotly_chart("attrition", "Net Talent Gain/Loss", None, summary_version(summary_file, df_raw), build,
+                     use_container_width=True, key="net_talent_change")
+
+
+@st.fragment
+def _year_sections(df_raw, summary_file, cube):
+    selected_year = select_year("attrition_year")
+    with span("attrition", "Year sections"):
+        # -----------------------------
+        # Row 0: Summary Metrics (Net Change fixed to use Summary tab col H)
+        # -----------------------------
+        total_employees = cube_total(cube, where={"Year": selected_year})
+        resigned = cube_total(cube, where={"Year": selected_year, "ResignedFlag": 1})
+        retained = total_employees - resigned
+
+        retention_rate = (retained / total_employees) * 100 if total_employees > 0 else 0
+        attrition_rate = (resigned / total_employees) * 100 if total_employees > 0 else 0
+
+        # Load official Net Change from Summary tab (Column H)
+        net_change_to_show = 0  # default
+        try:
+            with span("attrition", "Summary load"):
+                summary_df = get_summary_table(summary_file, df_raw)
+            if "Net Change" in summary_df.columns:
+                year_to_net = summary_df.set_index("Year")["Net Change"].to_dict()
+                net_change_to_show = year_to_net.get(selected_year, 0)
+        except Exception as e:
+            st.warning(f"Could not load Net Change from Summary sheet: {str(e)}")
+            net_change_to_show = 0
+
+        colA, colB, colC, colD, colE = st.columns(5)
+
+        with colA:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Total Employees</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{total_employees}</div>", unsafe_allow_html=True)
+
+        with colB:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Resigned</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{resigned}</div>", unsafe_allow_html=True)
+
+        with colC:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Retention Rate</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{retention_rate:.1f}%</div>", unsafe_allow_html=True)
+
+        with colD:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Attrition Rate</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{attrition_rate:.1f}%</div>", unsafe_allow_html=True)
+
+        with colE:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Net Change</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{net_change_to_show}</div>", unsafe_allow_html=True)
+
+        # -----------------------------
+        # Attrition by Month
+        # -----------------------------
+        with st.container(border=True), span("attrition", "Attrition by Month"):
+            st.markdown(f"#### Attrition by Month ({selected_year})")
+
+            def build():
+                year_rows = year_slice(df_raw, selected_year)
+                attrition_selected = year_rows[year_rows["ResignedFlag"] == 1].copy()
+                attrition_selected["Month"] = pd.to_datetime(attrition_selected["Resignation Date"]).dt.month_name()
+                monthly_attrition = (
+                    attrition_selected.groupby("Month")
+                    .size()
+                    .reindex([
+                        "January", "February", "March", "April", "May", "June",
+                        "July", "August", "September", "October", "November", "December"
+                    ])
+                    .reset_index(name="AttritionCount")
+                )
+                fig_monthly = px.bar(
+                    monthly_attrition, x="Month", y="AttritionCount", text="AttritionCount",
+                    color_discrete_sequence=["#00008B"]
                 )
-                fig_attrition.update_layout(
+                fig_monthly.update_layout(
                     height=300,
                     margin={"l": 20, "r": 20, "t": 20, "b": 20},
                     yaxis={"title": "Attrition Count"},
-                    xaxis={"title": "Year"},
+                    xaxis={"title": "Month"},
                     uniformtext_minsize=10,
-                    uniformtext_mode="hide"
+                    uniformtext_mode="hide",
+                    showlegend=False
                 )
-                st.plotly_chart(fig_attrition, use_container_width=True, key="attrition_by_type")
-            else:
-                st.info("No Voluntary/Involuntary attrition dataset provided yet.")
-
-    # -----------------------------
-    # Row 4: Net Talent Gain/Loss (already uses Summary tab Net Change)
-    # -----------------------------
-    with st.container(border=True):
-        st.markdown("#### Net Talent Gain/Loss")
+                return fig_monthly
 
-        summary_df_row4 = pd.read_excel(summary_file, sheet_name="Summary")
-        net_df = summary_df_row4[["Year", "Joins", "Resignations", "Net Change"]].copy()
-        net_df.rename(columns={"Net Change": "NetChange"}, inplace=True)
-        net_df["Status"] = net_df["NetChange"].apply(lambda x: "Increase" if x > 0 else "Decrease")
-        net_df["Status"] = pd.Categorical(net_df["Status"], categories=["Increase", "Decrease"], ordered=True)
-        net_df["Year"] = net_df["Year"].astype(str)
-
-        color_map = {"Increase": "#2E8B57", "Decrease": "#B22222"}
-        fig_net = px.bar(
-            net_df, x="Year", y="NetChange",
-            text=net_df["NetChange"].apply(lambda x: f"{x:+d}"),
-            color="Status", color_discrete_map=color_map,
-            hover_data={"Joins": True, "Resignations": True, "NetChange": True, "Status": True, "Year": True}
-        )
-        fig_net.update_layout(
-            height=320,
-            margin={"l": 20, "r": 20, "t": 20, "b": 20},
-            yaxis={"title": "Net Change"},
-            xaxis={"title": "Year"},
-            uniformtext_minsize=10,
-            uniformtext_mode="hide"
-        )
-        st.plotly_chart(fig_net, use_container_width=True, key="net_talent_change")
+            plotly_chart("attrition", "Attrition by Month", selected_year, dataset_token(df_raw), build,
+                         use_container_width=True, key="attrition_by_month")
@@ -0,0 +1,282 @@
+"""Headless dashboard benchmark (Streamlit AppTest)
+
+Drives every tab of web_app.py across every year on its radio selector and
+records cold and warm rerun wall time, the latency of switching into the
+tab from its tab button, peak RSS and the number of Excel workbooks opened
+per tab.  Each tab runs in a fresh interpreter, so its cold run starts from
+a new server process: nothing loaded or published for one tab is reused by
+the next.
+
+Usage:
+    python bench_app.py                       # run, write bench_results.json
+    python bench_app.py --check               # also compare with bench_baseline.json
+    python bench_app.py --update-baseline     # run and overwrite the baseline
+    python bench_app.py --cold-disk           # cold runs also wipe .cache (re-parse workbooks)
+    python bench_app.py --cold-disk --update-baseline   # how bench_baseline.json is recorded
+    python bench_app.py --data-dir synthetic/x10 --output bench_x10.json   # see synth_data.py
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from unittest import mock
+
+import openpyxl
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(HERE, "web_app.py")
+BASELINE = os.path.join(HERE, "bench_baseline.json")
+RESULTS = os.path.join(HERE, "bench_results.json")
+
+# (tab index, label, year radio key or None)
+TABS = [
+    (0, "Workforce", "workforce_year"),
+    (1, "Attrition & Retention", "attrition_year"),
+    (2, "Career Progression", "career_year"),
+    (3, "Survey & Feedback", "survey_year"),
+    (4, "About Us", None),
+]
+
+# Allowed slowdown of the warm p50 before --check fails
+WARM_TOLERANCE = 1.5
+
+# Timings are only compared against a baseline recorded on the same kind of machine
+MACHINE_KEYS = ["machine", "cpus"]
+
+
+class ExcelReadCounter:
+    """Counts workbook opens (every pandas/openpyxl Excel read goes through load_workbook)"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = openpyxl.load_workbook
+
+    def _load_workbook(self, *args, **kwargs):
+        self.count += 1
+        return self._original(*args, **kwargs)
+
+    def __enter__(self):
+        self._patch = mock.patch.object(openpyxl, "load_workbook", self._load_workbook)
+        self._patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._patch.stop()
+
+
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024, 1)
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"App raised: {[e.value for e in at.exception]}")
+    return round(elapsed, 1)
+
+
+def disk_caches():
+    """On-disk caches of the source workbooks, emptied before every cold run with --cold-disk"""
+    # Imported here, after --data-dir has set the environment they read
+    from excel_cache import EXCEL_CACHE_DIR
+    from partitions import PARTITION_DIR
+
+    return [EXCEL_CACHE_DIR, PARTITION_DIR]
+
+
+def new_app(tab_idx, cold_disk):
+    """Fresh app session with empty in-memory caches, opened on one tab"""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    if cold_disk:
+        for path in disk_caches():
+            shutil.rmtree(path, ignore_errors=True)
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.session_state["active_tab"] = tab_idx
+    return at
+
+
+def bench_navigation(at, tab_idx, repeat=3):
+    """Warm switch into a tab from a neighbouring one (clicks its tab button)"""
+    other = 1 if tab_idx == 0 else 0
+    times = []
+    for _ in range(repeat):
+        at.button(key=f"tab_{other}").click()
+        timed_run(at)
+        at.button(key=f"tab_{tab_idx}").click()
+        times.append(timed_run(at))
+    return round(statistics.median(times), 1)
+
+
+def bench_tab(tab_idx, label, radio_key, cold_disk):
+    at = new_app(tab_idx, cold_disk)
+
+    with ExcelReadCounter() as cold_reads:
+        cold_ms = timed_run(at)
+
+    per_year = {}
+    warm_times = []
+    with ExcelReadCounter() as warm_reads:
+        if radio_key is None:
+            warm_times = [timed_run(at) for _ in range(3)]
+        else:
+            years = list(at.radio(key=radio_key).options)
+            # First pass fills the per-year caches, second pass is all warm
+            for year in years:
+                at.radio(key=radio_key).set_value(int(year))
+                per_year[str(year)] = {"first_ms": timed_run(at)}
+            for year in years:
+                at.radio(key=radio_key).set_value(int(year))
+                elapsed = timed_run(at)
+                per_year[str(year)]["warm_ms"] = elapsed
+                warm_times.append(elapsed)
+        nav_ms = bench_navigation(at, tab_idx)
+
+    return {
+        "label": label,
+        "cold_ms": cold_ms,
+        "warm_p50_ms": round(statistics.median(warm_times), 1),
+        "warm_max_ms": round(max(warm_times), 1),
+        "nav_p50_ms": nav_ms,
+        "per_year": per_year,
+        "excel_reads_cold": cold_reads.count,
+        "excel_reads_warm": warm_reads.count,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_tab_process(tab_idx, cold_disk):
+    """bench_tab in a fresh interpreter (module state such as the published fingerprints,
+    the loaded employee frame and the startup preload would otherwise carry over)"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--tab", str(tab_idx)] + (["--cold-disk"] if cold_disk else [])
+    proc = subprocess.run(cmd, cwd=HERE, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Tab {tab_idx} failed:\n{proc.stderr[-4000:]}")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def prime_disk_cache():
+    """Open every tab once so the columnar cache holds every workbook the app reads"""
+    for tab_idx, _, _ in TABS:
+        new_app(tab_idx, cold_disk=False).run()
+
+
+def run_benchmark(cold_disk=False):
+    os.chdir(HERE)
+    if not cold_disk:
+        prime_disk_cache()
+    tabs = {}
+    for tab_idx, label, _ in TABS:
+        print(f"  {label} …", flush=True)
+        tabs[label] = bench_tab_process(tab_idx, cold_disk)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "cold_disk": cold_disk,
+            "data_dir": os.environ.get("ACJ_DATA_DIR", "."),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "tabs": tabs,
+    }
+
+
+def compare(results, baseline):
+    """Regressions against the baseline: any extra Excel read, or a warm p50 beyond tolerance
+
+    Cold read counts are only compared between runs with the same --cold-disk
+    setting, and timings only against a baseline from the same machine type
+    and CPU count.
+    """
+    problems = []
+    meta, base_meta = results["meta"], baseline.get("meta", {})
+    read_keys = ["excel_reads_warm"]
+    if meta["cold_disk"] == base_meta.get("cold_disk"):
+        read_keys.insert(0, "excel_reads_cold")
+    same_machine = all(meta[key] == base_meta.get(key) for key in MACHINE_KEYS)
+    if not same_machine:
+        print("Baseline recorded on " + ", ".join(f"{key}={base_meta.get(key)}" for key in MACHINE_KEYS)
+              + "; timings not compared")
+    for label, current in results["tabs"].items():
+        base = baseline["tabs"].get(label)
+        if base is None:
+            continue
+        for key in read_keys:
+            if current[key] > base[key]:
+                problems.append(f"{label}: {key} {base[key]} -> {current[key]}")
+        if not same_machine:
+            continue
+        for key in ["warm_p50_ms", "nav_p50_ms"]:
+            # Baselines written before a metric existed are not compared on it
+            if key in base and current[key] > base[key] * WARM_TOLERANCE:
+                problems.append(f"{label}: {key} {base[key]} ms -> {current[key]} ms")
+    return problems
+
+
+def print_table(results):
+    print(f"\n{'tab':<24} {'cold ms':>9} {'warm p50':>9} {'warm max':>9} {'nav p50':>9} {'xlsx cold':>10} {'xlsx warm':>10} {'RSS MB':>8}")
+    for label, r in results["tabs"].items():
+        print(f"{label:<24} {r['cold_ms']:>9} {r['warm_p50_ms']:>9} {r['warm_max_ms']:>9} {r['nav_p50_ms']:>9} "
+              f"{r['excel_reads_cold']:>10} {r['excel_reads_warm']:>10} {r['peak_rss_mb']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=RESULTS)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--check", action="store_true", help="exit 1 on a regression against the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--cold-disk", action="store_true", help="wipe the on-disk workbook caches before each cold run")
+    parser.add_argument("--data-dir", help="read the source workbooks from this directory (sets ACJ_DATA_DIR)")
+    # Internal: benchmark one tab in this process and print its result as JSON
+    parser.add_argument("--tab", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.environ["ACJ_DATA_DIR"] = os.path.abspath(args.data_dir)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    if args.tab is not None:
+        os.chdir(HERE)
+        print(json.dumps(bench_tab(*TABS[args.tab], cold_disk=args.cold_disk)))
+        return
+    results = run_benchmark(cold_disk=args.cold_disk)
+    print_table(results)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f))
+        if problems:
+            print("\nRegressions:")
+            for p in problems:
+                print(f"  - {p}")
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
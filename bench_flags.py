@@ -0,0 +1,103 @@
+"""Micro-benchmark: row-wise apply() flag converters vs flags.py
+
+Usage: python bench_flags.py [--sizes 10000 100000 1000000] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from flags import parse_flag, match_flag
+
+
+# -----------------------------
+# Row-wise converters being replaced (as they were in the tabs)
+# -----------------------------
+def to_num(x):
+    s = str(x).strip().upper()
+    if s in {"1", "YES", "TRUE"}:
+        return 1
+    if s in {"0", "NO", "FALSE"}:
+        return 0
+    try:
+        return float(s)
+    except ValueError:
+        return pd.NA
+
+
+def to_promo_flag(x):
+    s = str(x).strip().upper()
+    if s in {"1", "YES", "TRUE"}:
+        return 1
+    return 0
+
+
+def to_resigned_flag(x):
+    s = str(x).strip().upper()
+    return 0 if s == "ACTIVE" else 1
+
+
+# -----------------------------
+# Synthetic inputs
+# -----------------------------
+PROMO_VALUES = np.array([0, 1, "0", "1", " yes", "No", "TRUE", "false", "1.0", None, "n/a"], dtype=object)
+PROMO_WEIGHTS = [0.40, 0.10, 0.15, 0.05, 0.05, 0.10, 0.03, 0.07, 0.02, 0.02, 0.01]
+STATUS_VALUES = np.array(["ACTIVE", "LEAVER", " active", "Leaver ", None], dtype=object)
+STATUS_WEIGHTS = [0.80, 0.12, 0.04, 0.03, 0.01]
+
+
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    promo = pd.Series(rng.choice(PROMO_VALUES, size=n, p=PROMO_WEIGHTS))
+    status = pd.Series(rng.choice(STATUS_VALUES, size=n, p=STATUS_WEIGHTS))
+    return promo, status
+
+
+def best_of(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def check_equivalent(promo, status):
+    """The vectorized flags must agree with the row-wise converters"""
+    old_num = pd.to_numeric(promo.apply(to_num), errors="coerce")
+    expected = old_num.where(old_num.isin([0, 1])).astype("Int8")
+    pd.testing.assert_series_equal(parse_flag(promo), expected, check_names=False)
+
+    # to_promo_flag is only timed, not compared: it read "1.0" as 0, whereas
+    # to_num (and therefore parse_flag) reads it as 1
+
+    expected_resigned = status.apply(to_resigned_flag).astype("int8")
+    got_resigned = (1 - match_flag(status, "ACTIVE")).astype("int8")
+    pd.testing.assert_series_equal(got_resigned, expected_resigned, check_names=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        ("to_num -> parse_flag", lambda p, s: p.apply(to_num), lambda p, s: parse_flag(p)),
+        ("to_promo_flag -> parse_flag", lambda p, s: p.apply(to_promo_flag), lambda p, s: parse_flag(p).eq(1)),
+        ("to_resigned_flag -> match_flag", lambda p, s: s.apply(to_resigned_flag), lambda p, s: match_flag(s, "ACTIVE")),
+    ]
+
+    print(f"{'rows':>10}  {'converter':<32} {'apply (ms)':>11} {'vectorized (ms)':>16} {'speedup':>8}")
+    for n in args.sizes:
+        promo, status = make_inputs(n)
+        check_equivalent(promo, status)
+        for name, old, new in cases:
+            t_old, _ = best_of(lambda: old(promo, status), args.repeat)
+            t_new, _ = best_of(lambda: new(promo, status), args.repeat)
+            print(f"{n:>10,}  {name:<32} {t_old * 1000:>11.1f} {t_new * 1000:>16.1f} {t_old / t_new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Import-time report: what a new server process pays before the first render
+
+Each measurement runs in a fresh interpreter with `python -X importtime`, so
+nothing is shared through sys.modules.  "Startup" is what web_app.py imports
+at the top level; every tab is then measured on top of it, and the eager
+layout (every tab module imported at startup, as before tabs.py) is compared
+with the lazy one (only the Workforce tab, which is shown first).
+
+Usage: python bench_imports.py [--repeat 3] [--top 8]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+from tabs import TABS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+APP = os.path.join(HERE, "web_app.py")
+TAB_MODULES = [module for _, module, _ in TABS]
+
+
+def startup_modules(path=APP):
+    """Modules web_app.py imports at the top level, in source order (read from the file, never out of date)"""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules += [name for name in names if name not in modules]
+    return modules
+
+
+STARTUP = startup_modules()
+
+
+def import_profile(modules):
+    """{top-level package: cumulative µs} and the total for importing `modules` in a fresh process"""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented two spaces per level; keep the outermost
+        if name[1:].startswith(" "):
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative)
+    return packages, sum(packages.values())
+
+
+def median_profile(modules, repeat):
+    runs = [import_profile(modules) for _ in range(repeat)]
+    total = statistics.median(t for _, t in runs)
+    return min(runs, key=lambda r: abs(r[1] - total))[0], total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="packages listed per measurement")
+    args = parser.parse_args()
+
+    _, startup_us = median_profile(STARTUP, args.repeat)
+
+    print(f"{'modules':<32} {'total (ms)':>11} {'on top of startup (ms)':>23}")
+    print(f"{'startup':<32} {startup_us / 1000:>11.0f} {'':>23}")
+    for module in TAB_MODULES:
+        _, total = median_profile(STARTUP + [module], args.repeat)
+        print(f"{'+ ' + module:<32} {total / 1000:>11.0f} {(total - startup_us) / 1000:>23.0f}")
+
+    eager_packages, eager_us = median_profile(STARTUP + TAB_MODULES, args.repeat)
+    lazy_packages, lazy_us = median_profile(STARTUP + TAB_MODULES[:1], args.repeat)
+    print(f"\neager (every tab at startup): {eager_us / 1000:.0f} ms")
+    print(f"lazy (first tab only):        {lazy_us / 1000:.0f} ms")
+    print(f"cold-start saving:            {(eager_us - lazy_us) / 1000:.0f} ms")
+
+    print(f"\n{'package':<24} {'eager (ms)':>11} {'lazy (ms)':>10}")
+    for package, us in sorted(eager_packages.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{package:<24} {us / 1000:>11.0f} {lazy_packages.get(package, 0) / 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Server-side binning for charts
+# -----------------------------
+# Histograms and bubble charts are drawn from counts computed here, so a
+# figure carries one bar per bin (or one bubble per distinct point) rather
+# than one point per employee row, and its size stays flat as the data grows.
+
+
+def bin_edges(values, nbins=10):
+    """Bin edges for `values`; whole-number data gets whole-number bins"""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.array([0.0, 1.0])
+    lo, hi = values.min(), values.max()
+    if np.array_equal(values, np.round(values)):
+        width = max(1, int(np.ceil((hi - lo + 1) / nbins)))
+        count = int(np.ceil((hi - lo + 1) / width))
+        return lo + width * np.arange(count + 1, dtype=float)
+    return np.histogram_bin_edges(values, bins=nbins)
+
+
+def bin_labels(edges):
+    """Axis labels such as "30–34" (whole-number bins) or "1.5–2.25" """
+    if np.array_equal(edges, np.round(edges)):
+        return [f"{int(a)}" if b - a == 1 else f"{int(a)}–{int(b) - 1}" for a, b in zip(edges[:-1], edges[1:])]
+    return [f"{a:g}–{b:g}" for a, b in zip(edges[:-1], edges[1:])]
+
+
+def histogram(frame, x, weights=None, by=None, nbins=10):
+    """Counts per bin of `x` (summing `weights` when given), per `by` group; every group shares the same bins
+
+    Returns one row per (group, bin) with columns Bin (label), Start, End and
+    Count, ordered by group then bin.
+    """
+    values = pd.to_numeric(frame[x], errors="coerce").to_numpy(dtype=float)
+    edges = bin_edges(values, nbins)
+    labels = bin_labels(edges)
+    keep = ~np.isnan(values)
+
+    if by is None:
+        groups = [(None, keep)]
+    else:
+        codes, uniques = pd.factorize(frame[by], sort=True)
+        groups = [(value, keep & (codes == i)) for i, value in enumerate(uniques)]
+
+    parts = []
+    for value, mask in groups:
+        w = None if weights is None else frame[weights].to_numpy(dtype=float)[mask]
+        counts, _ = np.histogram(values[mask], bins=edges, weights=w)
+        part = pd.DataFrame({"Bin": labels, "Start": edges[:-1], "End": edges[1:], "Count": counts})
+        if by is not None:
+            part.insert(0, by, value)
+        parts.append(part)
+
+    columns = ([by] if by is not None else []) + ["Bin", "Start", "End", "Count"]
+    binned = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+    if weights is None or pd.api.types.is_integer_dtype(frame[weights]):
+        binned["Count"] = binned["Count"].round().astype(int)
+    return binned
+
+
+def bin_order(binned):
+    """Bin labels in axis order (for category_orders)"""
+    return list(dict.fromkeys(binned["Bin"]))
+
+
+def aggregate_points(frame, keys, value="Count"):
+    """Sum `value` over each distinct combination of `keys` (one bubble per point)"""
+    return frame.groupby(keys, as_index=False, observed=True)[value].sum()
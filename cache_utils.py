@@ -1,37 +1,242 @@
+import hashlib
+
 import streamlit as st
 import pandas as pd
+import numpy as np
+from excel_cache import data_path, read_excel
+from figure_cache import evict_version
+from flags import parse_flag, match_flag
+from partitions import partition_by_year, year_slice, year_token
+import watcher
 
+SUMMARY_FILE = data_path("HR Cleaned Data 01.09.26.xlsx")
+
+# Categorical columns of the canonical employee frame and their text casing
+CATEGORICAL_COLUMNS = {
+    "Resignee Checking": str.upper,
+    "Generation": str.title,
+    "Position/Level": None,
+    "Gender": str.capitalize,
+    "Age Bucket": str.capitalize,
+}
 
-@st.cache_data
-def normalize_raw_data(df_raw):
-    """Normalize common columns across all tabs"""
-    def to_num(x): 
-        s = str(x).strip().upper() 
-        if s in {"1", "YES", "TRUE"}: 
-            return 1 
-        if s in {"0", "NO", "FALSE"}: 
-            return 0 
-        try: 
-            return float(s) 
-        except: 
-            return pd.NA 
 
+def _to_category(series, case=None):
+    """Strip (and re-case) a text column once per distinct value and store it as categorical"""
+    values = series.astype("category")
+    categories = values.cat.categories.astype(str).str.strip()
+    if case is not None:
+        categories = categories.map(case)
+    # Code -1 (missing) picks the trailing None
+    lookup = np.append(np.asarray(categories, dtype=object), None)
+    return pd.Categorical(lookup[values.cat.codes.to_numpy()])
+
+
+def normalize_raw_data(df_raw):
+    """Canonical employee frame shared by all tabs (built once at ingest by data_store)"""
     df = df_raw.copy()
-    df["Promotion & Transfer"] = df["Promotion & Transfer"].apply(to_num)
+
+    # Parsed calendar year
     df["Calendar Year"] = pd.to_datetime(df["Calendar Year"], errors="coerce")
     df["Year"] = df["Calendar Year"].dt.year
-    df["Resignee Checking"] = df["Resignee Checking"].astype(str).str.strip().str.upper()
-    
+    if df["Year"].notna().all():
+        df["Year"] = df["Year"].astype(int)
+
+    # Cleaned text dimensions as categoricals
+    for col, case in CATEGORICAL_COLUMNS.items():
+        if col in df.columns:
+            df[col] = _to_category(df[col], case)
+
+    # Integer flags
+    df["Promotion & Transfer"] = parse_flag(df["Promotion & Transfer"])
+    df["ResignedFlag"] = (1 - match_flag(df["Resignee Checking"], "ACTIVE")).astype("int8")
+    df["Retention"] = (1 - df["ResignedFlag"]).astype("int8")
+
     return df
 
 
-@st.cache_data
+# -----------------------------
+# Dataset version tokens
+# -----------------------------
+# data_store tags every frame it loads with a token derived from the source
+# file hashes and the transform version (frame.attrs["dataset_version"]).
+# Derived caches key on that token instead of letting Streamlit hash whole
+# frames, so a lookup costs the same regardless of the number of rows.
+# Frames derived here get their own token so different subsets of the same
+# dataset never share a cache entry.
+
+VERSION_ATTR = "dataset_version"
+# Years changed by incremental extracts since the employee workbook (see ingest.py)
+DELTA_ATTR = "delta_years"
+
+
+def tag_version(frame, token):
+    """Attach a dataset version token to a frame"""
+    frame.attrs[VERSION_ATTR] = token
+    return frame
+
+
+def dataset_token(frame):
+    """Version token of a frame; untagged frames fall back to a content hash"""
+    token = frame.attrs.get(VERSION_ATTR)
+    if token is None:
+        token = hashlib.sha256(pd.util.hash_pandas_object(frame).values.tobytes()).hexdigest()[:16]
+    return token
+
+
+@st.cache_resource(max_entries=2)
+def _active_employees(token, _df_normalized):
+    # Filtering keeps the Year order, so the active rows are partitioned too
+    active = partition_by_year(_df_normalized[_df_normalized["ResignedFlag"] == 0])
+    return tag_version(active, f"{token}/active")
+
+
 def get_active_employees(df_normalized):
-    """Filter for active employees only"""
-    return df_normalized[df_normalized["Resignee Checking"] == "ACTIVE"]
+    """Filter for active employees only (shared result, handed out as a zero-copy view)"""
+    return _active_employees(dataset_token(df_normalized), df_normalized).copy(deep=False)
 
 
-@st.cache_data
 def get_year_data(df_normalized, year):
-    """Get data for a specific year"""
-    return df_normalized[df_normalized["Year"] == int(year)]
+    """Get data for a specific year (a zero-copy slice of a year-partitioned frame)"""
+    return year_slice(df_normalized, year).copy(deep=False)
+
+
+@st.cache_data(max_entries=2)
+def _load_summary_table(summary_file, fingerprint):
+    """Parse and type the Summary sheet (fingerprint keys the cache entry)"""
+    summary_df = read_excel(summary_file, sheet_name="Summary")
+    summary_df.columns = summary_df.columns.str.strip()
+
+    # Convert Year to integer, handling both datetime and numeric formats
+    if pd.api.types.is_datetime64_any_dtype(summary_df["Year"]):
+        summary_df["Year"] = summary_df["Year"].dt.year
+    else:
+        summary_df["Year"] = pd.to_numeric(summary_df["Year"], errors="coerce")
+    summary_df = summary_df.dropna(subset=["Year"])
+    summary_df["Year"] = summary_df["Year"].astype(int)
+
+    for col in ["Joins", "Resignations", "Net Change"]:
+        if col in summary_df.columns:
+            summary_df[col] = pd.to_numeric(summary_df[col], errors="coerce").fillna(0).astype(int)
+
+    return summary_df.reset_index(drop=True)
+
+
+def normalize_analysis_output(sheets):
+    """Clean the text columns of the HR_Analysis_Output sheets once at ingest"""
+    cleaned = {}
+    for name, sheet in sheets.items():
+        sheet = sheet.copy()
+        for col in ["Generation", "Gender"]:
+            if col in sheet.columns and not pd.api.types.is_numeric_dtype(sheet[col]):
+                sheet[col] = _to_category(sheet[col], CATEGORICAL_COLUMNS[col])
+        cleaned[name] = sheet
+    return cleaned
+
+
+# Summary columns derived from the yearly headcounts
+FLOW_COLUMNS = ["Starting Headcount", "Joins", "Resignations", "Ending Headcount",
+                "Retention Rate (%)", "Attrition Rate(%)", "Net Change"]
+COUNT_COLUMNS = ["Starting Headcount", "Joins", "Resignations", "Ending Headcount", "Net Change"]
+
+
+def _year_flows(year_rows, year):
+    """Ending headcount (active rows), resignations (leaver rows) and joiners of one year"""
+    joined = year_rows["Year Joined"]
+    if not pd.api.types.is_numeric_dtype(joined):
+        joined = pd.to_datetime(joined, errors="coerce").dt.year
+    resignations = int(year_rows["ResignedFlag"].sum())
+    return {"Ending Headcount": len(year_rows) - resignations, "Resignations": resignations,
+            "Joiners": int((joined == year).sum())}
+
+
+def _headcount_flow(start, end, resignations):
+    """Summary row of a year as the sheet defines it: joins are whatever the flow leaves unexplained"""
+    joins = end - start + resignations
+    return {
+        "Starting Headcount": start,
+        "Joins": joins,
+        "Resignations": resignations,
+        "Ending Headcount": end,
+        "Retention Rate (%)": (start - resignations) / start * 100 if start else 0.0,
+        "Attrition Rate(%)": resignations / ((start + end) / 2) * 100 if start + end else 0.0,
+        "Net Change": joins - resignations,
+    }
+
+
+def _delta_tokens(df_normalized):
+    """(year, token) of every year an incremental extract changed ((), without extracts)"""
+    if df_normalized is None:
+        return ()
+    return tuple(
+        (int(year), year_token(df_normalized, year) or f"{dataset_token(df_normalized)}/{int(year)}")
+        for year in df_normalized.attrs.get(DELTA_ATTR, [])
+    )
+
+
+@st.cache_data(max_entries=2)
+def _summary_with_deltas(summary_file, fingerprint, tokens, _df_normalized):
+    """Summary sheet with the years changed by extracts recomputed from the employee rows
+
+    A changed year's ending headcount and resignations come from its rows,
+    and its starting headcount is the previous year's ending headcount (the
+    rows that did not join that year, for the first year).  Joins, rates and
+    net change follow from those, for the changed years and for the years
+    whose starting headcount they move.  Rows whose headcounts come out as
+    the sheet has them are kept as they are.
+    """
+    flows = {year: _year_flows(year_slice(_df_normalized, year), year) for year, _ in tokens}
+    summary_df = _load_summary_table(summary_file, fingerprint).set_index("Year")
+    summary_df = summary_df.reindex(summary_df.index.union(pd.Index(list(flows), dtype=summary_df.index.dtype)))
+    for col in FLOW_COLUMNS:
+        if col not in summary_df.columns:
+            summary_df[col] = np.nan
+    summary_df[FLOW_COLUMNS] = summary_df[FLOW_COLUMNS].astype(float)
+
+    previous_end = None
+    for year in summary_df.index:
+        row = summary_df.loc[year]
+        if year in flows:
+            end, resignations = flows[year]["Ending Headcount"], flows[year]["Resignations"]
+        else:
+            end, resignations = row["Ending Headcount"], row["Resignations"]
+        if previous_end is not None:
+            start = previous_end
+        elif year in flows:
+            start = end + resignations - flows[year]["Joiners"]
+        else:
+            start = row["Starting Headcount"]
+        if [start, end, resignations] != row[["Starting Headcount", "Ending Headcount", "Resignations"]].tolist():
+            summary_df.loc[year, FLOW_COLUMNS] = pd.Series(_headcount_flow(start, end, resignations))
+        previous_end = end
+
+    for col in COUNT_COLUMNS:
+        summary_df[col] = summary_df[col].fillna(0).astype(int)
+    return summary_df.rename_axis("Year").reset_index()
+
+
+def summary_version(summary_file=SUMMARY_FILE, df_normalized=None):
+    """Published fingerprint of the Summary sheet (plus the years recomputed from extracts)"""
+    fingerprint = watcher.fingerprint(summary_file, "Summary")
+    tokens = _delta_tokens(df_normalized)
+    if not tokens:
+        return fingerprint
+    return fingerprint + "+" + "+".join(token for _, token in tokens)
+
+
+def get_summary_table(summary_file=SUMMARY_FILE, df_normalized=None):
+    """Typed Summary sheet, re-read only when the sheet changes
+
+    Given the canonical employee frame, the headcount flow of the years
+    incremental extracts changed is recomputed from its rows (see
+    _summary_with_deltas).
+    """
+    fingerprint = watcher.fingerprint(summary_file, "Summary")
+    tokens = _delta_tokens(df_normalized)
+    if not tokens:
+        return _load_summary_table(summary_file, fingerprint)
+    return _summary_with_deltas(summary_file, fingerprint, tokens, df_normalized)
+
+
+watcher.register("summary", [(SUMMARY_FILE, "Summary")], version=summary_version, rebuild=get_summary_table,
+                 evict=evict_version)
@@ -1,14 +1,17 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from cache_utils import normalize_raw_data, get_active_employees, get_year_data
+from binning import bin_order, histogram
+from cache_utils import dataset_token, get_active_employees, get_year_data
+from figure_cache import plotly_chart
+from hr_cube import build_count_cube, cube_slice, cube_total
+from perf import span
+from tabs import select_year
 
 
-def render(df, df_raw, selected_year):
-    # Use shared cached normalization
-    df_raw = normalize_raw_data(df_raw)
-    df_active = get_active_employees(df_raw)
-    career_year = get_year_data(df_active, selected_year)
+def render(df, df_raw, cube=None):
+    if cube is None:
+        cube = build_count_cube(df_raw)
 
     # -----------------------------
     # Executive Summary at the very top
@@ -37,46 +40,17 @@ def render(df, df_raw, selected_year):
     # -----------------------------
     st.markdown("## 🎯 Career Progression Metrics")
 
-    # Calculate metrics once
-    if not career_year.empty: 
-        total_promotions_transfers = int(
-            career_year["Promotion & Transfer"].fillna(0).eq(1).sum()
-        )
-        avg_tenure = pd.to_numeric(career_year["Tenure"], errors="coerce").mean()
-        active_count = len(career_year)
-        promotion_rate = (total_promotions_transfers / active_count * 100) if active_count > 0 else 0
-    else: 
-        total_promotions_transfers = 0 
-        avg_tenure = 0 
-        promotion_rate = 0
-
-    # Top metrics row
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Promotions & Transfers</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{total_promotions_transfers}</div>", unsafe_allow_html=True)
-    
-    with col2:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Average Tenure</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{avg_tenure:.1f} yrs</div>", unsafe_allow_html=True)
-    
-    with col3:
-        with st.container(border=True):
-            st.markdown("<div class='metric-label'>Promotion Rate</div>", unsafe_allow_html=True)
-            st.markdown(f"<div class='metric-value'>{promotion_rate:.1f}%</div>", unsafe_allow_html=True)
-
     st.markdown("<style>h2 { margin-bottom: -0.5rem !important; } </style>", unsafe_allow_html=True)
 
+    # Year selector, metrics and the tenure histogram (reruns on its own)
+    _year_sections(df_raw, cube)
+
     # Promotion & Transfer Tracking
-    with st.container(border=True):
+    with st.container(border=True), span("career", "Promotion & Transfer Tracking"):
         st.markdown("#### Promotion & Transfer Tracking") 
 
-        # Pre-compute summary tables
-        promo_summary = df_active.groupby("Year", as_index=False)["Promotion & Transfer"].sum()
-        pos_summary = df_active.groupby(["Year", "Position/Level"], as_index=False)["Promotion & Transfer"].sum()
+        # Summary tables are sliced inside each chart's build() (skipped on a figure cache hit)
+        promoted = {"ResignedFlag": 0, "Promoted": 1}
 
         # Two charts side by side
         col1, col2 = st.columns(2)
@@ -84,63 +58,122 @@ def render(df, df_raw, selected_year):
         with col1:
             # Line chart for yearly trend
             st.markdown("##### Promotions & Transfers per Year")
-            fig1 = px.line(
-                promo_summary,
-                x="Year",
-                y="Promotion & Transfer",
-                markers=True
-            )
-            fig1.update_traces(line=dict(width=3, color="#00008B"), marker=dict(size=8, color="#00008B"))
-            fig1.update_layout(
-                height=250,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                xaxis_title="Year",
-                yaxis_title="Count"
-            )
-            st.plotly_chart(fig1, use_container_width=True)
+
+            def build():
+                promo_summary = cube_slice(cube, "Year", where=promoted, name="Promotion & Transfer")
+                fig1 = px.line(
+                    promo_summary,
+                    x="Year",
+                    y="Promotion & Transfer",
+                    markers=True
+                )
+                fig1.update_traces(line=dict(width=3, color="#00008B"), marker=dict(size=8, color="#00008B"))
+                fig1.update_layout(
+                    height=250,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    xaxis_title="Year",
+                    yaxis_title="Count"
+                )
+                return fig1
+
+            plotly_chart("career", "Promotions & Transfers per Year", None, dataset_token(cube), build,
+                         use_container_width=True)
 
         with col2:
             # Stacked bar chart for position/level distribution
             st.markdown("##### By Position/Level")
-            fig2 = px.bar(
-                pos_summary,
-                x="Year",
-                y="Promotion & Transfer",
-                color="Position/Level",
-                color_discrete_map={"Associate": "#6495ED", "Manager & Up": "#00008B"}
-            )
-            fig2.update_layout(
-                height=250,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                yaxis={"title": "Count"},
-                xaxis={"title": "Year"}
-            )
-            st.plotly_chart(fig2, use_container_width=True)
-
-    # Tenure Distribution of Promoted Employees
-    with st.container(border=True):
-        st.markdown(f"#### Tenure Distribution of Promoted Employees ({selected_year})")
-        promoted_employees = career_year[career_year["Promotion & Transfer"] == 1]
-
-        if not promoted_employees.empty:
-            fig3 = px.histogram(
-                promoted_employees,
-                x="Tenure",
-                nbins=10,
-                histnorm=None,
-                color_discrete_sequence=["#00008B"]
-            )
-            fig3.update_traces(
-                texttemplate="%{y}",
-                textposition="outside"
-            )
-            fig3.update_layout(
-                height=250,
-                margin={"l": 20, "r": 20, "t": 20, "b": 20},
-                yaxis={"title": "Count"},
-                xaxis={"title": "Tenure (years)"},
-                showlegend=False
-            )
-            st.plotly_chart(fig3, use_container_width=True)
+
+            def build():
+                pos_summary = cube_slice(cube, ["Year", "Position/Level"], where=promoted, name="Promotion & Transfer")
+                fig2 = px.bar(
+                    pos_summary,
+                    x="Year",
+                    y="Promotion & Transfer",
+                    color="Position/Level",
+                    color_discrete_map={"Associate": "#6495ED", "Manager & Up": "#00008B"}
+                )
+                fig2.update_layout(
+                    height=250,
+                    margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                    yaxis={"title": "Count"},
+                    xaxis={"title": "Year"}
+                )
+                return fig2
+
+            plotly_chart("career", "Promotions & Transfers by Position/Level", None, dataset_token(cube), build,
+                         use_container_width=True)
+
+
+@st.fragment
+def _year_sections(df_raw, cube):
+    selected_year = select_year("career_year")
+    with span("career", "Year sections"):
+        # df_raw is the canonical frame from cache_utils.normalize_raw_data
+        df_active = get_active_employees(df_raw)
+        career_year = get_year_data(df_active, selected_year)
+
+        # Calculate metrics once
+        active_where = {"Year": int(selected_year), "ResignedFlag": 0}
+        if not career_year.empty:
+            total_promotions_transfers = cube_total(cube, where={**active_where, "Promoted": 1})
+            avg_tenure = pd.to_numeric(career_year["Tenure"], errors="coerce").mean()
+            active_count = cube_total(cube, where=active_where)
+            promotion_rate = (total_promotions_transfers / active_count * 100) if active_count > 0 else 0
         else:
-            st.info("No promoted employees found for the selected year.")
+            total_promotions_transfers = 0
+            avg_tenure = 0
+            promotion_rate = 0
+
+        # Top metrics row
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Promotions & Transfers</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{total_promotions_transfers}</div>", unsafe_allow_html=True)
+
+        with col2:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Average Tenure</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{avg_tenure:.1f} yrs</div>", unsafe_allow_html=True)
+
+        with col3:
+            with st.container(border=True):
+                st.markdown("<div class='metric-label'>Promotion Rate</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='metric-value'>{promotion_rate:.1f}%</div>", unsafe_allow_html=True)
+
+        # Tenure Distribution of Promoted Employees
+        with st.container(border=True), span("career", "Tenure Distribution of Promoted Employees"):
+            st.markdown(f"#### Tenure Distribution of Promoted Employees ({selected_year})")
+            promoted_employees = career_year[career_year["Promotion & Transfer"] == 1]
+
+            if not promoted_employees.empty:
+
+                def build():
+                    # Binned here so the figure holds 10 bars, not one value per employee
+                    tenure_bins = histogram(promoted_employees, "Tenure", nbins=10)
+                    fig3 = px.bar(
+                        tenure_bins,
+                        x="Bin",
+                        y="Count",
+                        category_orders={"Bin": bin_order(tenure_bins)},
+                        color_discrete_sequence=["#00008B"]
+                    )
+                    fig3.update_traces(
+                        texttemplate="%{y}",
+                        textposition="outside"
+                    )
+                    fig3.update_layout(
+                        height=250,
+                        margin={"l": 20, "r": 20, "t": 20, "b": 20},
+                        yaxis={"title": "Count"},
+                        xaxis={"title": "Tenure (years)"},
+                        bargap=0.05,
+                        showlegend=False
+                    )
+                    return fig3
+
+                plotly_chart("career", "Tenure Distribution of Promoted Employees", selected_year, dataset_token(df_raw), build,
+                             use_container_width=True)
+            else:
+                st.info("No promoted employees found for the selected year.")
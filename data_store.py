@@ -0,0 +1,212 @@
+import hashlib
+import os
+
+import streamlit as st
+import pandas as pd
+from excel_cache import data_path, read_columns, read_excel, stream_source
+from cache_utils import normalize_raw_data, normalize_analysis_output, tag_version
+from figure_cache import evict_version
+import analysis_engine
+from hr_cube import count_cube
+from ingest import DELTA_DIR, apply_delta
+from partitions import partition_by_year, read_partitions, write_partitions, years
+import watcher
+
+# -----------------------------
+# Shared, read-only HR dataset
+# -----------------------------
+# The frames are loaded and canonicalized once per dataset version and kept
+# in a resource cache, so sessions share one copy instead of unpickling
+# their own on every rerun.  Sessions never receive the shared frames
+# themselves: every accessor hands out a shallow (zero-copy) view, and with
+# copy-on-write any column assignment or in-place edit made by a tab lands on
+# that view only.
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # Always on from pandas 3.0
+    pd.set_option("mode.copy_on_write", True)
+
+ANALYSIS_FILE = data_path("HR_Analysis_Output.xlsx")
+EMPLOYEE_FILE = data_path("HR Cleaned Data 01.09.26.xlsx")
+ATTRITION_FILE = data_path("Attrition-Vol and Invol.xlsx")
+
+# The HR_Analysis_Output tables are computed from the employee data
+# (analysis_engine.py); ACJ_ANALYSIS_SOURCE=workbook reads the offline
+# workbook instead
+ANALYSIS_SOURCE = os.environ.get("ACJ_ANALYSIS_SOURCE", "engine")
+
+# (workbook, sheet) pairs a dataset is built from; None is every sheet (or,
+# for the delta directory, every extract in it)
+SOURCES = [(EMPLOYEE_FILE, "Data"), (ATTRITION_FILE, 0), (DELTA_DIR, None)]
+if ANALYSIS_SOURCE == "workbook":
+    SOURCES.insert(0, (ANALYSIS_FILE, None))
+SOURCE_FILES = [path for path, _ in SOURCES]
+
+# HR_Analysis_Output columns each tab reads when they come from the workbook;
+# only these are loaded (streamed, see excel_cache.read_columns).  Declare a
+# column here before using it.
+ANALYSIS_COLUMNS = {
+    "workforce": {
+        "Tenure Analysis": ["Year", "YearJoined", "Tenure", "Count"],
+        "Resignation Trends": ["Year", "LeaverCount"],
+        "Headcount Per Year": ["Year"],
+        "Age Distribution": ["Year", "Age", "Generation", "Count"],
+        "Gender Diversity": ["Year", "Gender", "Position/Level", "Count"],
+    },
+}
+# Declared columns read as numbers (Excel errors become NaN, footer label rows are dropped)
+ANALYSIS_NUMERIC = ["Year", "YearJoined", "Tenure", "Count", "LeaverCount", "Age"]
+stream_source(ANALYSIS_FILE)
+
+# Bump whenever the canonicalization/aggregation in load_dataset changes
+TRANSFORM_VERSION = 5
+
+# Last employee frame built in this process: the base for applying new extracts
+_latest_employees = {"version": None, "frame": None}
+
+
+def dataset_version():
+    """Token for the published sources: sheet content hashes + transform version"""
+    h = hashlib.sha256(f"transform={TRANSFORM_VERSION}".encode())
+    for path, sheet in SOURCES:
+        h.update(f"|{path}:{sheet}={watcher.fingerprint(path, sheet)}".encode())
+    return h.hexdigest()[:16]
+
+
+def analysis_columns():
+    """Union of the per-tab column manifests, {sheet: [column, ...]} in declaration order"""
+    merged = {}
+    for sheets in ANALYSIS_COLUMNS.values():
+        for sheet, columns in sheets.items():
+            wanted = merged.setdefault(sheet, [])
+            wanted += [col for col in columns if col not in wanted]
+    return merged
+
+
+def employee_versions():
+    """Stored versions of the employee data: [(version, extract applied last or None)]
+
+    The first is the Data sheet alone, then one more per extract in the
+    delta directory, in apply order.
+    """
+    h = hashlib.sha256(f"transform={TRANSFORM_VERSION}|data={watcher.fingerprint(EMPLOYEE_FILE, 'Data')}".encode())
+    versions = [(h.hexdigest()[:16], None)]
+    for name, fingerprint in watcher.members(DELTA_DIR).items():
+        h.update(f"|{name}={fingerprint}".encode())
+        versions.append((h.hexdigest()[:16], os.path.join(DELTA_DIR, name)))
+    return versions
+
+
+def _newest_built(versions):
+    """(position in `versions`, frame) of the newest employee state held in memory or stored"""
+    for i in range(len(versions) - 1, -1, -1):
+        version = versions[i][0]
+        if _latest_employees["version"] == version:
+            return i, _latest_employees["frame"]
+        frame = read_partitions(version)
+        if frame is not None:
+            return i, frame
+    return None, None
+
+
+def load_employees():
+    """Canonical employee frame, partitioned by Year, with every extract applied
+
+    Starts from the newest state already built and applies only the extracts
+    after it, so a new extract costs time in proportion to the years it
+    touches; the Data sheet is parsed and normalized only when nothing is.
+    """
+    versions = employee_versions()
+    start, df_raw = _newest_built(versions)
+    if df_raw is None:
+        start = 0
+        df_raw = partition_by_year(normalize_raw_data(read_excel(EMPLOYEE_FILE, sheet_name="Data")))
+        try:
+            df_raw = write_partitions(df_raw, versions[0][0])
+        except OSError:
+            # Read-only cache directory: the next process normalizes again
+            pass
+    for (source_version, _), (version, extract) in zip(versions[start:], versions[start + 1:]):
+        df_raw = apply_delta(df_raw, extract, source_version, version)
+
+    _latest_employees.update(version=versions[-1][0], frame=df_raw)
+    return df_raw
+
+
+class Dataset:
+    """Immutable bundle of the shared frames; accessors return zero-copy views"""
+
+    __slots__ = ("version", "_analysis", "_employees", "_attrition", "_cube")
+
+    def __init__(self, version, analysis, employees, attrition, cube):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "_analysis", analysis)
+        object.__setattr__(self, "_employees", employees)
+        object.__setattr__(self, "_attrition", attrition)
+        object.__setattr__(self, "_cube", cube)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Dataset is read-only")
+
+    @property
+    def years(self):
+        """Calendar years in the employee data, from its partition index"""
+        return years(self._employees)
+
+    @property
+    def analysis(self):
+        """HR_Analysis_Output sheets keyed by sheet name"""
+        return {name: sheet.copy(deep=False) for name, sheet in self._analysis.items()}
+
+    @property
+    def employees(self):
+        """Canonical employee frame (see cache_utils.normalize_raw_data)"""
+        return self._employees.copy(deep=False)
+
+    @property
+    def attrition(self):
+        """Voluntary/involuntary status per employee-year"""
+        return self._attrition.copy(deep=False)
+
+    @property
+    def cube(self):
+        """Pre-aggregated count cube (see hr_cube.build_count_cube)"""
+        return self._cube.copy(deep=False)
+
+
+@st.cache_resource(show_spinner="Loading HR data…", max_entries=2)
+def _load_dataset(version):
+    # A view: the frame itself stays the base for the next extract
+    df_raw = load_employees().copy(deep=False)
+    if ANALYSIS_SOURCE == "workbook":
+        df = normalize_analysis_output(read_columns(ANALYSIS_FILE, analysis_columns(), ANALYSIS_NUMERIC))
+    else:
+        df = analysis_engine.analysis_tables(df_raw)
+        if analysis_engine.EXPORT:
+            try:
+                analysis_engine.export_xlsx(df, version)
+            except OSError:
+                pass
+    df_attrition = read_excel(ATTRITION_FILE)
+    if "Year" not in df_attrition.columns and "Calendar Year" in df_attrition.columns:
+        df_attrition["Year"] = pd.to_datetime(df_attrition["Calendar Year"]).dt.year
+    cube = count_cube(df_raw)
+
+    # Every frame carries the version token; derived caches key on it
+    for name, sheet in df.items():
+        tag_version(sheet, f"{version}/{name}")
+    tag_version(df_raw, version)
+    tag_version(df_attrition, f"{version}/attrition")
+    tag_version(cube, f"{version}/cube")
+
+    return Dataset(version, df, df_raw, df_attrition, cube)
+
+
+def load_dataset():
+    """Load, canonicalize and aggregate every source once per dataset version"""
+    return _load_dataset(dataset_version())
+
+
+# Rebuilt in the background when the Data sheet, the analysis workbook, the
+# attrition sheet or the extracts in the delta directory change (see watcher.py)
+watcher.register("dataset", SOURCES, version=dataset_version, rebuild=load_dataset, evict=evict_version)
@@ -0,0 +1,197 @@
+import os
+import threading
+
+import streamlit as st
+import pandas as pd
+from cache_utils import dataset_token
+import model_store
+from partitions import year_slice, year_token
+
+# scikit-learn is only imported where a model is fitted (usually a warm-up
+# worker), so the app process does not pay for it at startup
+
+# -----------------------------
+# Driver analysis targets
+# -----------------------------
+TARGETS = {
+    "resignation": {
+        "label": "Resigned",
+        "features": ["Tenure", "Position/Level", "Generation", "Gender", "Promotion & Transfer"],
+    },
+    "promotion": {
+        "label": "Promoted",
+        "features": ["Tenure", "Position/Level", "Generation", "Gender"],
+    },
+}
+
+CATEGORICAL_FEATURES = ["Position/Level", "Generation", "Gender"]
+
+
+def prepare_training_slice(df_raw, year, target):
+    """Encoded features + label for one year and target, NaN rows removed (expects the canonical frame)"""
+    spec = TARGETS[target]
+    features = spec["features"]
+    label = spec["label"]
+
+    if target == "resignation":
+        df_analysis = year_slice(df_raw, year).copy()
+        df_analysis[label] = df_analysis["ResignedFlag"].astype(int)
+    else:
+        df_year = year_slice(df_raw, year)
+        df_analysis = df_year[df_year["ResignedFlag"] == 0].copy()
+        df_analysis[label] = df_analysis["Promotion & Transfer"].eq(1).fillna(False).astype(int)
+
+    # Encode categorical variables (sorted codes, as sklearn's LabelEncoder)
+    df_encoded = df_analysis[features + [label]].copy()
+    for col in CATEGORICAL_FEATURES:
+        if col in df_encoded.columns:
+            df_encoded[col] = pd.factorize(df_encoded[col].astype(str), sort=True)[0]
+
+    return df_encoded.dropna().reset_index(drop=True)
+
+
+def fit_driver_model(df_encoded, target):
+    """Fit the Random Forest and derive importance and correlation tables"""
+    from sklearn.ensemble import RandomForestClassifier
+
+    spec = TARGETS[target]
+    features = spec["features"]
+    label = spec["label"]
+
+    rf = RandomForestClassifier(n_estimators=100, random_state=42)
+    rf.fit(df_encoded[features], df_encoded[label])
+
+    importance_df = pd.DataFrame({
+        "Driver": features,
+        "Importance": rf.feature_importances_
+    }).sort_values("Importance", ascending=False)
+    importance_df["Importance %"] = (importance_df["Importance"] * 100).round(1)
+
+    correlation = df_encoded[features + [label]].corr()[label].drop(label).sort_values(ascending=False)
+
+    return {"model": rf, "importance": importance_df, "correlation": correlation}
+
+
+def _load_or_fit(key, df_encoded, target):
+    entry = model_store.load(key)
+    if entry is None:
+        entry = fit_driver_model(df_encoded, target)
+        model_store.save(key, entry)
+    return entry
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _driver_tables(key, _df_encoded, target):
+    """Importance and correlation tables for a fingerprint (the frame itself is not hashed)"""
+    entry = _load_or_fit(key, _df_encoded, target)
+    return entry["importance"], entry["correlation"]
+
+
+def _slice_token(df_raw, year):
+    # Per-year content token where the frame has one, so an extract that
+    # changes some years leaves the other years' slices cached
+    return year_token(df_raw, year) or dataset_token(df_raw)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _training_slice(token, year, target, _df_raw):
+    """Encoded slice and its model-store fingerprint, computed once per year's data"""
+    df_encoded = prepare_training_slice(_df_raw, year, target)
+    key = model_store.fingerprint(df_encoded, year, target, TARGETS[target]["features"])
+    return key, df_encoded
+
+
+def get_driver_analysis(df_raw, year, target):
+    """Importance and correlation tables, loaded from the model store when the slice is unchanged"""
+    key, df_encoded = _training_slice(_slice_token(df_raw, year), int(year), target, df_raw)
+
+    # Wait for the warm-up job if this slice is still being fitted in the background
+    future = _warmup_state()["jobs"].get(key)
+    if future is not None and not future.done():
+        with st.spinner(f"Computing {target} drivers for {year}…"):
+            try:
+                future.result()
+            except Exception:
+                pass  # fall back to fitting in-process below
+
+    return _driver_tables(key, df_encoded, target)
+
+
+# -----------------------------
+# Background warm-up of every (year, target) model
+# -----------------------------
+def _fit_and_store(key, df_encoded, target):
+    """Worker entry point: fit one model and write it to the store"""
+    model_store.save(key, fit_driver_model(df_encoded, target))
+    return key
+
+
+@st.cache_resource
+def _warmup_state():
+    """In-flight warm-up jobs keyed by fingerprint (a job is dropped once it finishes)"""
+    return {"jobs": {}, "lock": threading.Lock()}
+
+
+def _forget_when_done(key, future):
+    state = _warmup_state()
+
+    def done(_):
+        with state["lock"]:
+            if state["jobs"].get(key) is future:
+                del state["jobs"][key]
+
+    # May run the callback right away, so never called under the state lock
+    future.add_done_callback(done)
+
+
+def _get_pool():
+    from joblib.externals.loky import get_reusable_executor
+
+    # loky workers are spawned without re-running the Streamlit script as
+    # __main__ (a stdlib spawn/forkserver pool would execute web_app.py in
+    # every child), and idle workers exit after the timeout
+    return get_reusable_executor(max_workers=os.cpu_count() or 1, timeout=300)
+
+
+def _prune_when_done(futures, keys):
+    """Drop the stored models no slice in `keys` uses once every one of `futures` has finished"""
+    if not futures:
+        model_store.prune(keys)
+        return
+    remaining = {"count": len(futures)}
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining["count"] -= 1
+            last = remaining["count"] == 0
+        if last:
+            model_store.prune(keys)
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+@st.cache_resource(show_spinner=False)
+def _start_warmup(token, years, _df_raw):
+    state = _warmup_state()
+    keys, submitted = set(), {}
+    with state["lock"]:
+        for year in years:
+            for target in TARGETS:
+                key, df_encoded = _training_slice(_slice_token(_df_raw, year), int(year), target, _df_raw)
+                if df_encoded.empty:
+                    continue
+                keys.add(key)
+                if key in state["jobs"] or model_store.exists(key):
+                    continue
+                state["jobs"][key] = submitted[key] = _get_pool().submit(_fit_and_store, key, df_encoded, target)
+    for key, future in submitted.items():
+        _forget_when_done(key, future)
+    _prune_when_done(list(submitted.values()), keys)
+    return len(submitted)
+
+
+def start_warmup(df_raw, years):
+    """Submit a fit for every (year, target) not yet in the model store, then prune it; runs once per dataset version"""
+    return _start_warmup(dataset_token(df_raw), tuple(years), df_raw)
@@ -0,0 +1,415 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+
+# -----------------------------
+# Columnar on-disk cache for the Excel sources
+# -----------------------------
+# Every sheet of a workbook is converted to Parquet the first time the
+# workbook is read.  The converted files live in a directory named after the
+# workbook's content hash, so a later start only re-parses a workbook whose
+# contents actually changed.  A small stat index (size + mtime) avoids
+# re-hashing files that have not been touched.  The manifest also records a
+# hash of every parsed sheet, so callers can tell which sheets changed.
+#
+# Workbooks marked with stream_source() are never parsed whole: their rows
+# are streamed with openpyxl in read-only mode, a chunk at a time, to hash
+# every sheet and to load only the columns a caller declares
+# (read_columns()), so peak memory no longer grows with the workbook.
+
+DATA_DIR = os.environ.get("ACJ_DATA_DIR", ".")
+CACHE_DIR = os.environ.get("ACJ_CACHE_DIR", ".cache")
+EXCEL_CACHE_DIR = os.path.join(CACHE_DIR, "excel")
+STAT_INDEX = os.path.join(EXCEL_CACHE_DIR, "stat-index.json")
+STREAM_CACHE_DIR = os.path.join(EXCEL_CACHE_DIR, "streamed")
+CHUNK_ROWS = int(os.environ.get("ACJ_EXCEL_CHUNK_ROWS", "50000"))
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+_index_lock = threading.Lock()  # workbooks may be fingerprinted from several threads
+_streamed = set()
+
+# Cell values of Excel errors (openpyxl returns them as text); read as missing, as pd.read_excel does
+EXCEL_ERRORS = frozenset(["#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A"])
+
+
+def _load_stat_index():
+    try:
+        with open(STAT_INDEX) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_stat_index(index):
+    os.makedirs(EXCEL_CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=EXCEL_CACHE_DIR, suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, STAT_INDEX)
+
+
+def data_path(name):
+    """Path of a source workbook (ACJ_DATA_DIR points the app at another dataset)"""
+    return os.path.join(DATA_DIR, name)
+
+
+def content_hash(path):
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_fingerprint(path):
+    """Content fingerprint of a source file, re-hashed only when size/mtime change"""
+    st_ = os.stat(path)
+    key = os.path.abspath(path)
+    index = _load_stat_index()
+    entry = index.get(key)
+    if entry and entry["size"] == st_.st_size and entry["mtime_ns"] == st_.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = content_hash(path)
+    with _index_lock:
+        index = _load_stat_index()
+        index[key] = {"size": st_.st_size, "mtime_ns": st_.st_mtime_ns, "sha256": digest}
+        try:
+            _save_stat_index(index)
+        except OSError:
+            pass
+    return digest
+
+
+def directory_fingerprints(path):
+    """{workbook name: content fingerprint} of the workbooks in a directory, by name ({} when it does not exist)"""
+    if not os.path.isdir(path):
+        return {}
+    names = sorted(name for name in os.listdir(path) if name.endswith(".xlsx") and not name.startswith("~$"))
+    return {name: file_fingerprint(os.path.join(path, name)) for name in names}
+
+
+def _entry_dir(path, digest):
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    return os.path.join(EXCEL_CACHE_DIR, f"{stem}-{digest[:16]}")
+
+
+def _write_sheet(frame, target_base):
+    """Write one sheet as Parquet, falling back to pickle for mixed-type columns"""
+    if HAS_PARQUET:
+        try:
+            frame.to_parquet(target_base + ".parquet")
+            return "parquet"
+        except (ValueError, TypeError):
+            # pyarrow raises ArrowInvalid/ArrowTypeError (ValueError/TypeError
+            # subclasses) for object columns such as "Year" holding ints and
+            # footer labels like "Average"
+            if os.path.exists(target_base + ".parquet"):
+                os.remove(target_base + ".parquet")
+    frame.to_pickle(target_base + ".pkl")
+    return "pickle"
+
+
+def _sheet_hash(frame):
+    """Content fingerprint of one parsed sheet (values and column names)"""
+    try:
+        h = hashlib.sha256(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    except (TypeError, ValueError):
+        # Unhashable cell values: the sheet falls back to the file fingerprint
+        return None
+    h.update(json.dumps([str(c) for c in frame.columns]).encode())
+    return h.hexdigest()
+
+
+def _read_sheet(entry_dir, item):
+    base = os.path.join(entry_dir, item["file"])
+    if item["format"] == "parquet":
+        return pd.read_parquet(base + ".parquet")
+    return pd.read_pickle(base + ".pkl")
+
+
+def _convert(path, entry_dir):
+    """Parse every sheet of a workbook once and store it in columnar form"""
+    sheets = pd.read_excel(path, sheet_name=None)
+
+    os.makedirs(EXCEL_CACHE_DIR, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=EXCEL_CACHE_DIR, prefix=".tmp-")
+    manifest = {"source": os.path.basename(path), "sheets": []}
+    try:
+        for i, (name, frame) in enumerate(sheets.items()):
+            file_base = f"sheet{i:02d}"
+            fmt = _write_sheet(frame, os.path.join(tmp_dir, file_base))
+            manifest["sheets"].append({"name": name, "file": file_base, "format": fmt, "sha256": _sheet_hash(frame)})
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process converted the same workbook first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        _prune_stale(entry_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return sheets
+
+
+def _prune_stale(entry_dir):
+    """Drop conversions of older versions of the same workbook"""
+    parent, keep = os.path.split(entry_dir)
+    prefix = keep[:-16]
+    for name in os.listdir(parent):
+        if name != keep and name.startswith(prefix) and len(name) == len(keep):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
+def _select(sheets, sheet_name):
+    if sheet_name is None:
+        return sheets
+    if isinstance(sheet_name, int):
+        return list(sheets.values())[sheet_name]
+    if isinstance(sheet_name, list):
+        return {s: _select(sheets, s) for s in sheet_name}
+    return sheets[sheet_name]
+
+
+def read_excel(path, sheet_name=0):
+    """Drop-in for pd.read_excel backed by the columnar cache"""
+    digest = file_fingerprint(path)
+    entry_dir = _entry_dir(path, digest)
+    manifest_path = os.path.join(entry_dir, "manifest.json")
+
+    if not os.path.exists(manifest_path):
+        return _select(_convert(path, entry_dir), sheet_name)
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    items = manifest["sheets"]
+    if sheet_name is None:
+        wanted = items
+    elif isinstance(sheet_name, int):
+        wanted = [items[sheet_name]]
+    else:
+        names = sheet_name if isinstance(sheet_name, list) else [sheet_name]
+        by_name = {item["name"]: item for item in items}
+        missing = [n for n in names if n not in by_name]
+        if missing:
+            raise ValueError(f"Worksheet named '{missing[0]}' not found")
+        wanted = [by_name[n] for n in names]
+
+    sheets = {item["name"]: _read_sheet(entry_dir, item) for item in wanted}
+    if sheet_name is None or isinstance(sheet_name, list):
+        return sheets
+    return next(iter(sheets.values()))
+
+
+def sheet_fingerprints(path):
+    """{sheet name: content fingerprint} in workbook order, converting the workbook if needed
+
+    Sheets whose contents could not be hashed (and conversions made before
+    sheet hashes were recorded) get a fingerprint derived from the file's.
+    """
+    if os.path.abspath(path) in _streamed:
+        return _scan(path)
+    digest = file_fingerprint(path)
+    entry_dir = _entry_dir(path, digest)
+    manifest_path = os.path.join(entry_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        _convert(path, entry_dir)
+    with open(manifest_path) as f:
+        items = json.load(f)["sheets"]
+    return {item["name"]: item.get("sha256") or f"{digest}/{item['name']}" for item in items}
+
+
+# -----------------------------
+# Streaming reads (openpyxl read-only mode)
+# -----------------------------
+
+def stream_source(path):
+    """Only ever stream this workbook: sheet fingerprints and read_columns() never parse it whole"""
+    _streamed.add(os.path.abspath(path))
+
+
+def _stream_dir(path, digest):
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    return os.path.join(STREAM_CACHE_DIR, f"{stem}-{digest[:16]}")
+
+
+def _open_workbook(path):
+    from openpyxl import load_workbook
+
+    # data_only: cached formula results, as pd.read_excel returns them
+    return load_workbook(path, read_only=True, data_only=True)
+
+
+def _write_json(data, target):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, target)
+
+
+def _scan(path):
+    """{sheet name: fingerprint} from one streamed pass over every row (cached per file version)"""
+    digest = file_fingerprint(path)
+    entry_dir = _stream_dir(path, digest)
+    sheets_path = os.path.join(entry_dir, "sheets.json")
+    if os.path.exists(sheets_path):
+        with open(sheets_path) as f:
+            return json.load(f)
+
+    fingerprints = {}
+    workbook = _open_workbook(path)
+    try:
+        for worksheet in workbook.worksheets:
+            h = hashlib.sha256()
+            for row in worksheet.iter_rows(values_only=True):
+                h.update(repr(row).encode())
+                h.update(b"\n")
+            fingerprints[worksheet.title] = h.hexdigest()
+    finally:
+        workbook.close()
+
+    os.makedirs(entry_dir, exist_ok=True)
+    _write_json(fingerprints, sheets_path)
+    _prune_stale(entry_dir)
+    return fingerprints
+
+
+def _compact(frame, numeric=()):
+    """Numbers for the `numeric` columns, smallest integer dtypes, categoricals for all-text columns"""
+    for col in frame.columns:
+        values = frame[col]
+        if col in numeric:
+            values = pd.to_numeric(values, errors="coerce")
+        if pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            frame[col] = pd.to_numeric(values, downcast="integer")
+        elif not pd.api.types.is_numeric_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.infer_objects()
+            # Mixed columns (numbers and text) are left as they are
+            is_text = pd.api.types.infer_dtype(values, skipna=True) in {"string", "empty"}
+            frame[col] = values.astype("category") if is_text else values
+        else:
+            frame[col] = values
+    return frame
+
+
+def _concat_chunks(chunks, columns, numeric=()):
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    merged = {}
+    for col in columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            merged[col] = pd.Series(pd.api.types.union_categoricals([part.array for part in parts]))
+        else:
+            merged[col] = pd.concat([part.astype(object) if isinstance(part.dtype, pd.CategoricalDtype) else part
+                                     for part in parts], ignore_index=True)
+    return _compact(pd.DataFrame(merged), numeric)
+
+
+def _is_label(value):
+    """Text that does not read as a number"""
+    if not isinstance(value, str):
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return True
+    return False
+
+
+def _stream_sheet(worksheet, columns, chunk_rows, numeric=()):
+    """Declared columns of one sheet, materialized a chunk of rows at a time
+
+    Excel error values are read as missing.  A row holding text in one of
+    the `numeric` columns (a footer such as "Average" under the Year column)
+    is not a data row and is skipped.
+    """
+    rows = worksheet.iter_rows(values_only=True)
+    header = [None if value is None else str(value) for value in next(rows, ())]
+    # First occurrence of each declared column; undeclared and missing ones are skipped
+    positions = [(col, header.index(col)) for col in columns if col in header]
+    names = [col for col, _ in positions]
+    checked = [j for j, col in enumerate(names) if col in numeric]
+
+    chunks, buffer = [], []
+    for row in rows:
+        values = tuple(row[i] if i < len(row) else None for _, i in positions)
+        if any(isinstance(value, str) for value in values):
+            values = tuple(None if value in EXCEL_ERRORS else value for value in values)
+            if any(_is_label(values[j]) for j in checked):
+                continue
+        if all(value is None for value in values):
+            continue
+        buffer.append(values)
+        if len(buffer) >= chunk_rows:
+            chunks.append(_compact(pd.DataFrame.from_records(buffer, columns=names), numeric))
+            buffer = []
+    if buffer:
+        chunks.append(_compact(pd.DataFrame.from_records(buffer, columns=names), numeric))
+    return _concat_chunks(chunks, names, numeric)
+
+
+def read_columns(path, columns, numeric=(), chunk_rows=CHUNK_ROWS):
+    """{sheet: frame} holding only the declared columns ({sheet: [column, ...]}) of a workbook
+
+    Rows are streamed, so memory is bounded by the declared columns rather
+    than the workbook.  Columns named in `numeric` are read as numbers (see
+    _stream_sheet).  The result is cached per file version and column set.
+    """
+    digest = file_fingerprint(path)
+    key = hashlib.sha256(json.dumps([columns, sorted(numeric)]).encode()).hexdigest()[:12]
+    entry_dir = os.path.join(_stream_dir(path, digest), f"columns-{key}")
+    manifest_path = os.path.join(entry_dir, "manifest.json")
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            items = json.load(f)["sheets"]
+        return {item["name"]: _read_sheet(entry_dir, item) for item in items}
+
+    sheets = {}
+    workbook = _open_workbook(path)
+    try:
+        for name, wanted in columns.items():
+            if name in workbook.sheetnames:
+                sheets[name] = _stream_sheet(workbook[name], wanted, chunk_rows, numeric)
+    finally:
+        workbook.close()
+
+    os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), prefix=".tmp-")
+    manifest = {"source": os.path.basename(path), "columns": columns, "numeric": sorted(numeric), "sheets": []}
+    try:
+        for i, (name, frame) in enumerate(sheets.items()):
+            file_base = f"sheet{i:02d}"
+            fmt = _write_sheet(frame, os.path.join(tmp_dir, file_base))
+            manifest["sheets"].append({"name": name, "file": file_base, "format": fmt})
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process streamed the same column set first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        _prune_stale(_stream_dir(path, digest))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return sheets
+
+
+def clear_cache():
+    """Remove every converted workbook"""
+    shutil.rmtree(EXCEL_CACHE_DIR, ignore_errors=True)
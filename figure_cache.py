@@ -0,0 +1,83 @@
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# -----------------------------
+# Process-wide cache of finished Plotly figures
+# -----------------------------
+# Keyed by (tab, section, year, data version); year is None for charts that
+# show every year.  A hit skips both the pandas work and the Plotly
+# construction/validation that builds the figure.  The finished Figure object
+# is kept (st.plotly_chart serializes a Figure without validating it again,
+# whereas figure JSON handed back to it would be rebuilt and re-validated);
+# its JSON size is what counts against the cap.  Least recently used entries
+# are evicted once the cache holds more than ACJ_FIGURE_CACHE_MB of JSON.
+
+MAX_BYTES = int(float(os.environ.get("ACJ_FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+
+
+@st.cache_resource
+def _store():
+    return {"entries": OrderedDict(), "bytes": 0, "hits": 0, "misses": 0, "lock": threading.Lock()}
+
+
+def get_figure(tab, section, year, version, build):
+    """Cached figure for the key; `build()` makes it on a miss"""
+    key = (tab, section, None if year is None else int(year), version)
+    store = _store()
+    with store["lock"]:
+        entry = store["entries"].get(key)
+        if entry is not None:
+            store["entries"].move_to_end(key)
+            store["hits"] += 1
+            return entry[0]
+        store["misses"] += 1
+
+    figure = build()
+    size = len(figure.to_json())
+    with store["lock"]:
+        if key not in store["entries"]:
+            store["entries"][key] = (figure, size)
+            store["bytes"] += size
+        while store["bytes"] > MAX_BYTES and len(store["entries"]) > 1:
+            _, (_, evicted) = store["entries"].popitem(last=False)
+            store["bytes"] -= evicted
+    return figure
+
+
+def plotly_chart(tab, section, year, version, build, **kwargs):
+    """st.plotly_chart of the cached figure (kwargs are passed through)"""
+    st.plotly_chart(get_figure(tab, section, year, version, build), **kwargs)
+
+
+def evict_version(version):
+    """Drop every figure built from a data version (matched as a substring of the entry's version)"""
+    store = _store()
+    with store["lock"]:
+        stale = [key for key in store["entries"] if version in str(key[3])]
+        for key in stale:
+            _, size = store["entries"].pop(key)
+            store["bytes"] -= size
+    return len(stale)
+
+
+def stats():
+    """Entry count, JSON bytes held and hit/miss counters"""
+    store = _store()
+    with store["lock"]:
+        return {
+            "entries": len(store["entries"]),
+            "bytes": store["bytes"],
+            "hits": store["hits"],
+            "misses": store["misses"],
+        }
+
+
+def clear():
+    """Drop every cached figure"""
+    store = _store()
+    with store["lock"]:
+        store["entries"].clear()
+        store["bytes"] = 0
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Vectorized flag parsing
+# -----------------------------
+# HR exports encode yes/no columns inconsistently ("Yes", " 1", 1.0, "TRUE",
+# 0, "no", ...).  Instead of a Python function per row, each distinct value is
+# parsed once with array operations and the result is broadcast back through
+# the factorized codes.
+
+TRUE_TOKENS = ["1", "YES", "TRUE"]
+FALSE_TOKENS = ["0", "NO", "FALSE"]
+
+
+def _broadcast(series, codes, parsed):
+    """Map per-unique results back to every row; code -1 (missing) becomes NaN"""
+    lookup = np.append(np.asarray(parsed, dtype=float), np.nan)
+    return pd.Series(lookup[codes], index=series.index)
+
+
+def parse_flag(values):
+    """Nullable Int8 flag from yes/no/true/false/1/0 encodings; anything else is <NA>"""
+    series = pd.Series(values)
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype("Int8")
+    if pd.api.types.is_numeric_dtype(series):
+        return series.where(series.isin([0, 1])).astype("Int8")
+
+    codes, uniques = pd.factorize(series)
+    text = pd.Index(uniques).astype(str).str.strip().str.upper()
+    parsed = pd.to_numeric(pd.Series(text), errors="coerce")
+    parsed[text.isin(TRUE_TOKENS)] = 1
+    parsed[text.isin(FALSE_TOKENS)] = 0
+    parsed = parsed.where(parsed.isin([0, 1]))
+    return _broadcast(series, codes, parsed).astype("Int8")
+
+
+def match_flag(values, token):
+    """int8 flag: 1 where the stripped, upper-cased value equals `token` (missing counts as no match)"""
+    series = pd.Series(values)
+    codes, uniques = pd.factorize(series)
+    text = pd.Index(uniques).astype(str).str.strip().str.upper()
+    parsed = (text == token.upper()).astype(float)
+    return _broadcast(series, codes, parsed).fillna(0).astype("int8")
@@ -0,0 +1,64 @@
+import streamlit as st
+import pandas as pd
+from partitions import concat, partition_index, year_slice, year_token
+
+# -----------------------------
+# Pre-aggregated employee count cube
+# -----------------------------
+# One groupby over the raw rows yields the number of employee-year records
+# for every combination of the dimensions below.  Headcount, retention,
+# resignation and promotion charts are sums over slices of this table, which
+# has a few hundred rows regardless of how many employees there are.
+# Year is a dimension, so the cube of a year-partitioned frame is the
+# concatenation of per-year cubes; count_cube() caches those by year token
+# and only regroups the years whose rows changed.
+
+CUBE_DIMENSIONS = ["Year", "Position/Level", "Generation", "Gender", "ResignedFlag", "Promoted"]
+
+
+def build_count_cube(df_raw):
+    """Employee-year counts for every combination of CUBE_DIMENSIONS (expects the canonical frame)"""
+    keys = df_raw[["Year", "Position/Level", "Generation", "Gender", "ResignedFlag"]].copy()
+    keys["Promoted"] = df_raw["Promotion & Transfer"].eq(1).fillna(False).astype("int8")
+
+    return (
+        keys.groupby(CUBE_DIMENSIONS, dropna=False, observed=True)
+        .size()
+        .reset_index(name="Count")
+    )
+
+
+@st.cache_resource(max_entries=64)
+def _year_cube(token, year, _df_raw):
+    return build_count_cube(year_slice(_df_raw, year))
+
+
+def count_cube(df_raw):
+    """build_count_cube, assembled from per-year cubes cached by year token when the frame has them"""
+    index = partition_index(df_raw)
+    if index is None or sum(stop - start for start, stop in index.values()) != len(df_raw):
+        # Not partitioned, or rows without a year
+        return build_count_cube(df_raw)
+    tokens = {year: year_token(df_raw, year) for year in index}
+    if not index or None in tokens.values():
+        return build_count_cube(df_raw)
+    return concat([_year_cube(tokens[year], year, df_raw) for year in sorted(index)])
+
+
+def _filter(cube, where):
+    if not where:
+        return cube
+    mask = pd.Series(True, index=cube.index)
+    for dim, value in where.items():
+        mask &= cube[dim] == value
+    return cube[mask]
+
+
+def cube_slice(cube, by, where=None, name="Count"):
+    """Sum the cube counts over `by`, keeping only rows matching `where` ({dimension: value})"""
+    return _filter(cube, where).groupby(by, dropna=False, observed=True)["Count"].sum().reset_index(name=name)
+
+
+def cube_total(cube, where=None):
+    """Total count over the rows matching `where`"""
+    return int(_filter(cube, where)["Count"].sum())
@@ -0,0 +1,64 @@
+import logging
+import os
+import time
+
+import pandas as pd
+from cache_utils import DELTA_ATTR, normalize_raw_data
+from excel_cache import data_path, read_excel
+from partitions import concat, partition_by_year, replace_years, year_slice, years
+
+# -----------------------------
+# Incremental employee extracts
+# -----------------------------
+# A monthly export no longer has to replace the employee workbook: put a
+# delta workbook (the Data sheet's columns, holding new or changed
+# employee-year rows) in ACJ_DELTA_DIR.  Deltas are applied in file-name
+# order on top of the stored, year-partitioned employee data.  A delta row
+# replaces the stored row with the same EMPLOYEE_KEY; other rows are added.
+# Only the years a delta touches are normalized, merged, written and
+# re-hashed.  Their new year tokens are what invalidates the per-year
+# aggregates: count cube, Summary flows and driver-analysis models.
+
+DELTA_DIR = os.environ.get("ACJ_DELTA_DIR", data_path("deltas"))
+EMPLOYEE_KEY = ["Full Name", "Year"]
+
+logger = logging.getLogger("acj.ingest")
+
+
+def read_delta(path):
+    """Canonical, year-partitioned rows of one delta workbook (the last row wins per key)"""
+    delta = normalize_raw_data(read_excel(path, sheet_name=0))
+    return partition_by_year(delta.drop_duplicates(EMPLOYEE_KEY, keep="last"))
+
+
+def _stored_dtypes(new, old):
+    """`new` with its all-missing columns cast to the stored dtypes (an empty Excel column reads as float)"""
+    new = new[old.columns.intersection(new.columns, sort=False)]
+    for col in new.columns:
+        if new[col].dtype == old[col].dtype or isinstance(old[col].dtype, pd.CategoricalDtype):
+            continue
+        if new[col].isna().all():
+            try:
+                new[col] = new[col].astype(old[col].dtype)
+            except (TypeError, ValueError):
+                pass
+    return new
+
+
+def merge_year(old, new):
+    """One year's rows with `new` replacing the rows of the same key and adding the others"""
+    replaced = pd.MultiIndex.from_frame(old[EMPLOYEE_KEY]).isin(pd.MultiIndex.from_frame(new[EMPLOYEE_KEY]))
+    return concat([old[~replaced], _stored_dtypes(new, old)])
+
+
+def apply_delta(frame, path, source_version, version):
+    """Partitioned employee frame (stored as `source_version`) with one delta merged in, stored as `version`"""
+    start = time.perf_counter()
+    delta = read_delta(path)
+    touched = years(delta)
+    parts = {year: merge_year(year_slice(frame, year), year_slice(delta, year)) for year in touched}
+    delta_years = sorted(set(frame.attrs.get(DELTA_ATTR, [])) | set(touched))
+    merged = replace_years(frame, parts, source_version, version, attrs={DELTA_ATTR: delta_years})
+    logger.info("applied %s (%d rows, years %s) in %.0f ms", os.path.basename(path), len(delta),
+                ", ".join(map(str, touched)), (time.perf_counter() - start) * 1000)
+    return merged
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import joblib
+import pandas as pd
+from excel_cache import CACHE_DIR
+
+# -----------------------------
+# On-disk registry of fitted driver-analysis models
+# -----------------------------
+# Entries are keyed by a fingerprint of the exact training slice plus the
+# year, target and feature list, so a model is only refitted when the data
+# it was trained on changes.  Each entry stores the fitted estimator together
+# with its importance table and correlation vector.  Entries no current
+# training slice uses are pruned once a warm-up has fitted every slice of a
+# data version (see prune()).
+
+MODEL_DIR = os.path.join(CACHE_DIR, "models")
+
+# Bump when the encoding or the estimator settings change
+MODEL_VERSION = 1
+
+
+def fingerprint(training_slice, year, target, features):
+    """Content fingerprint of a training slice and its model settings"""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(training_slice, index=False).values.tobytes())
+    h.update(json.dumps({
+        "columns": list(training_slice.columns),
+        "year": int(year),
+        "target": target,
+        "features": list(features),
+        "version": MODEL_VERSION,
+    }, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _path(key):
+    return os.path.join(MODEL_DIR, f"{key}.joblib")
+
+
+def exists(key):
+    """Whether an entry is stored for a fingerprint"""
+    return os.path.exists(_path(key))
+
+
+def load(key):
+    """Stored entry for a fingerprint, or None"""
+    try:
+        return joblib.load(_path(key))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Unreadable entry (partial write, incompatible sklearn): refit
+        return None
+
+
+def save(key, entry):
+    """Persist an entry atomically"""
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=MODEL_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        joblib.dump(entry, tmp)
+        os.replace(tmp, _path(key))
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def prune(keep, spare=None):
+    """Remove stored entries not in `keep` except the `spare` most recently written ones (default len(keep))
+
+    The spares cover sessions still on the previous data version.  Returns
+    the number of entries removed.
+    """
+    keep = set(keep)
+    spare = len(keep) if spare is None else spare
+    try:
+        names = os.listdir(MODEL_DIR)
+    except FileNotFoundError:
+        return 0
+
+    others = []
+    for name in names:
+        key, ext = os.path.splitext(name)
+        if ext != ".joblib" or key in keep:
+            continue
+        try:
+            others.append((os.path.getmtime(_path(key)), key))
+        except FileNotFoundError:
+            pass
+    others.sort(reverse=True)
+
+    removed = 0
+    for _, key in others[spare:]:
+        try:
+            os.remove(_path(key))
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def clear():
+    """Remove every stored model"""
+    shutil.rmtree(MODEL_DIR, ignore_errors=True)
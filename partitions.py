@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from excel_cache import CACHE_DIR, HAS_PARQUET
+
+# -----------------------------
+# Year-partitioned employee data
+# -----------------------------
+# The canonical employee frame is kept sorted by Year with a partition index
+# ({year: (start, stop)} row ranges) in frame.attrs, so the rows of one year
+# are an O(1) positional slice instead of a boolean mask over every year.
+# The index only describes the frame it was built for: a filtered or
+# reordered frame (whose length or index differs) falls back to a mask.
+#
+# On disk each year of a dataset version is its own file under
+# .cache/partitions/<version>/, listed in index.json, so one year can be
+# read, or added, without reading or rewriting the others.  Every stored
+# year also gets a content token (year_token()): caches of per-year results
+# key on it, so replacing some years leaves the others' entries valid.
+
+PARTITION_DIR = os.path.join(CACHE_DIR, "partitions")
+ATTR = "year_partitions"
+
+
+def partition_by_year(frame):
+    """`frame` sorted by Year (stable) on a fresh RangeIndex, with its partition index attached"""
+    if not frame["Year"].is_monotonic_increasing:
+        frame = frame.iloc[np.argsort(frame["Year"].to_numpy(), kind="stable")]
+    frame = frame.reset_index(drop=True)
+
+    values = frame["Year"].to_numpy()
+    distinct = pd.unique(values[~pd.isna(values)])
+    starts = np.searchsorted(values, distinct, side="left")
+    stops = np.searchsorted(values, distinct, side="right")
+    frame.attrs[ATTR] = {
+        "rows": len(frame),
+        "years": {int(year): (int(start), int(stop)) for year, start, stop in zip(distinct, starts, stops)},
+    }
+    return frame
+
+
+def partition_index(frame):
+    """{year: (start, stop)} when `frame` still has the layout partition_by_year gave it, else None"""
+    index = frame.attrs.get(ATTR)
+    if index is None or len(frame) != index["rows"]:
+        return None
+    if not isinstance(frame.index, pd.RangeIndex) or frame.index.start != 0 or frame.index.step != 1:
+        return None
+    return index["years"]
+
+
+def years(frame):
+    """Years present in `frame`, ascending"""
+    index = partition_index(frame)
+    if index is not None:
+        return sorted(index)
+    return sorted(int(year) for year in frame["Year"].dropna().unique())
+
+
+def year_token(frame, year):
+    """Content token of one year of a stored partitioned frame, or None"""
+    if partition_index(frame) is None:
+        return None
+    return frame.attrs[ATTR].get("tokens", {}).get(int(year))
+
+
+def _content_token(part):
+    h = hashlib.sha256(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+    h.update(json.dumps([str(col) for col in part.columns]).encode())
+    return h.hexdigest()[:16]
+
+
+def concat(parts):
+    """Concatenate frames with the same columns, merging the category sets of categorical columns"""
+    frame = pd.concat(parts, ignore_index=True)
+    for col in parts[0].columns:
+        # Different category sets concatenate to object (str on pandas 3)
+        if isinstance(parts[0][col].dtype, pd.CategoricalDtype) and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = pd.Categorical(
+                pd.api.types.union_categoricals(
+                    [pd.Categorical(part[col]) for part in parts], ignore_order=True
+                )
+            )
+    return frame
+
+
+def year_slice(frame, year):
+    """Rows of one year: a positional slice of a partitioned frame, a boolean mask otherwise"""
+    index = partition_index(frame)
+    if index is None:
+        return frame[frame["Year"] == int(year)]
+    start, stop = index.get(int(year), (0, 0))
+    return frame.iloc[start:stop]
+
+
+# -----------------------------
+# On-disk layout
+# -----------------------------
+
+def _version_dir(version):
+    return os.path.join(PARTITION_DIR, version)
+
+
+def _read_index(version):
+    try:
+        with open(os.path.join(_version_dir(version), "index.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_index(version, index):
+    fd, tmp = tempfile.mkstemp(dir=_version_dir(version), suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp, os.path.join(_version_dir(version), "index.json"))
+
+
+def _write_part(part, target_base):
+    if HAS_PARQUET:
+        try:
+            part.to_parquet(target_base + ".parquet")
+            return "parquet"
+        except (ValueError, TypeError):
+            if os.path.exists(target_base + ".parquet"):
+                os.remove(target_base + ".parquet")
+    part.to_pickle(target_base + ".pkl")
+    return "pickle"
+
+
+def _read_part(version, entry):
+    base = os.path.join(_version_dir(version), entry["file"])
+    if entry["format"] == "parquet":
+        return pd.read_parquet(base + ".parquet")
+    return pd.read_pickle(base + ".pkl")
+
+
+def write_year(version, year, part, token=None):
+    """Store (or replace) one year of a dataset version; the other years are not touched"""
+    os.makedirs(_version_dir(version), exist_ok=True)
+    index = _read_index(version) or {"years": {}, "attrs": {}}
+    file_base = f"Year={int(year)}"
+    # Written under a temporary name so readers of the index never see half a file
+    tmp_base = os.path.join(_version_dir(version), f".tmp-{file_base}")
+    fmt = _write_part(part.reset_index(drop=True), tmp_base)
+    ext = ".parquet" if fmt == "parquet" else ".pkl"
+    os.replace(tmp_base + ext, os.path.join(_version_dir(version), file_base + ext))
+    token = token or _content_token(part)
+    index["years"][str(int(year))] = {"file": file_base, "format": fmt, "rows": len(part), "token": token}
+    _write_index(version, index)
+    return token
+
+
+def _link_year(source_version, version, entry):
+    """Reuse a stored year file in another version (hard link, copy where links are unsupported)"""
+    ext = ".parquet" if entry["format"] == "parquet" else ".pkl"
+    source = os.path.join(_version_dir(source_version), entry["file"] + ext)
+    target = os.path.join(_version_dir(version), entry["file"] + ext)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _publish(tmp_version, version):
+    try:
+        os.rename(_version_dir(tmp_version), _version_dir(version))
+    except OSError:
+        # Another process stored the same version first
+        shutil.rmtree(_version_dir(tmp_version), ignore_errors=True)
+    prune(keep=version)
+
+
+def _new_version_dir():
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+    return os.path.basename(tempfile.mkdtemp(dir=PARTITION_DIR, prefix=".tmp-"))
+
+
+def _attach_tokens(frame, tokens):
+    frame.attrs[ATTR]["tokens"] = {int(year): token for year, token in tokens.items()}
+    return frame
+
+
+def write_partitions(frame, version, attrs=None):
+    """Store every year of a frame as a new dataset version and drop the other stored versions
+
+    Returns the partitioned frame with its year tokens attached; `attrs` are
+    stored with the version and restored on the frame by read_partitions().
+    """
+    if partition_index(frame) is None:
+        frame = partition_by_year(frame)
+    tmp_version = _new_version_dir()
+    try:
+        tokens = {}
+        for year, (start, stop) in partition_index(frame).items():
+            tokens[year] = write_year(tmp_version, year, frame.iloc[start:stop])
+        index = _read_index(tmp_version) or {"years": {}}
+        index["attrs"] = attrs or {}
+        _write_index(tmp_version, index)
+    except Exception:
+        shutil.rmtree(_version_dir(tmp_version), ignore_errors=True)
+        raise
+    _publish(tmp_version, version)
+    frame.attrs.update(attrs or {})
+    return _attach_tokens(frame, tokens)
+
+
+def replace_years(frame, parts, source_version, version, attrs=None):
+    """`frame` with the years in `parts` ({year: rows}) replaced, stored as a new version
+
+    Only the replaced years are written (and hashed); the stored files of the
+    other years are linked from `source_version`.  Returns the partitioned
+    frame with its year tokens attached.
+    """
+    index = partition_index(frame)
+    source = _read_index(source_version)
+    tokens = dict(frame.attrs[ATTR].get("tokens", {}))
+    pieces = []
+    for year in sorted(set(index) | set(parts)):
+        if year in parts:
+            pieces.append(parts[year])
+        else:
+            start, stop = index[year]
+            pieces.append(frame.iloc[start:stop])
+    merged = partition_by_year(concat(pieces))
+    merged.attrs.update(attrs or {})
+    merged_index = partition_index(merged)
+    for year in parts:
+        start, stop = merged_index[year]
+        tokens[year] = _content_token(merged.iloc[start:stop])
+
+    try:
+        tmp_version = _new_version_dir()
+    except OSError:
+        return _attach_tokens(merged, {year: tokens.get(year) for year in merged_index})
+    try:
+        for year, (start, stop) in merged_index.items():
+            entry = source["years"].get(str(year)) if source else None
+            if year not in parts and entry is not None:
+                _link_year(source_version, tmp_version, entry)
+                new_index = _read_index(tmp_version) or {"years": {}}
+                new_index["years"][str(year)] = entry
+                _write_index(tmp_version, new_index)
+                tokens[year] = entry.get("token") or tokens.get(year)
+            else:
+                tokens[year] = write_year(tmp_version, year, merged.iloc[start:stop], tokens.get(year))
+        new_index = _read_index(tmp_version) or {"years": {}}
+        new_index["attrs"] = attrs or {}
+        _write_index(tmp_version, new_index)
+    except OSError:
+        # Unwritable cache: serve the merged frame; the next process merges again
+        shutil.rmtree(_version_dir(tmp_version), ignore_errors=True)
+    except Exception:
+        shutil.rmtree(_version_dir(tmp_version), ignore_errors=True)
+        raise
+    else:
+        _publish(tmp_version, version)
+    return _attach_tokens(merged, {year: tokens.get(year) for year in merged_index})
+
+
+def stored_years(version):
+    """Years stored for a dataset version, ascending ([] when it is not stored)"""
+    index = _read_index(version)
+    return sorted(int(year) for year in index["years"]) if index else []
+
+
+def read_partitions(version, years=None):
+    """Partitioned frame of a stored version (only `years` when given), or None when it is not stored"""
+    index = _read_index(version)
+    if not index or not index["years"]:
+        return None
+    wanted = sorted(int(year) for year in index["years"]) if years is None else sorted(int(y) for y in years)
+    entries = {year: index["years"][str(year)] for year in wanted if str(year) in index["years"]}
+    if not entries:
+        return None
+    frame = partition_by_year(concat([_read_part(version, entry) for entry in entries.values()]))
+    frame.attrs.update(index.get("attrs", {}))
+    return _attach_tokens(frame, {year: entry.get("token") for year, entry in entries.items()})
+
+
+def prune(keep):
+    """Remove every stored version except `keep`"""
+    if not os.path.isdir(PARTITION_DIR):
+        return
+    for name in os.listdir(PARTITION_DIR):
+        # .tmp- directories are versions another process is still writing
+        if name != keep and not name.startswith(".tmp-"):
+            shutil.rmtree(os.path.join(PARTITION_DIR, name), ignore_errors=True)
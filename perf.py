@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+import pandas as pd
+
+# -----------------------------
+# Per-section timing
+# -----------------------------
+# Wrap a section in `with span("survey", "Driver Analysis – By Resignation"):`
+# to record its wall time.  Timings are only collected while the debug panel
+# is on for the session (open the app with ?debug=1 and use the sidebar
+# toggle) or when ACJ_PERF_LOG=1 is set; otherwise span() is a shared no-op
+# context.  Each recorded span is also emitted as one JSON line on the
+# "acj.perf" logger.
+
+LOG_ENABLED = os.environ.get("ACJ_PERF_LOG", "") not in {"", "0"}
+WINDOW = 200  # samples kept per section
+BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000]  # histogram upper bounds
+
+logger = logging.getLogger("acj.perf")
+if LOG_ENABLED and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_NOOP = nullcontext()
+
+
+@st.cache_resource
+def _registry():
+    """Process-wide rolling samples keyed by (tab, section)"""
+    return {"samples": {}, "lock": threading.Lock()}
+
+
+def enabled():
+    """Whether timings are being collected for this run"""
+    if LOG_ENABLED:
+        return True
+    try:
+        return bool(st.session_state.get("perf_panel", False))
+    except Exception:
+        return False
+
+
+def record(tab, section, elapsed_ms):
+    """Add one sample to the rolling window and emit it as a JSON log line"""
+    registry = _registry()
+    with registry["lock"]:
+        samples = registry["samples"].setdefault((tab, section), deque(maxlen=WINDOW))
+        samples.append(elapsed_ms)
+    logger.info(json.dumps({
+        "event": "span",
+        "tab": tab,
+        "section": section,
+        "ms": round(elapsed_ms, 3),
+        "ts": time.time(),
+    }))
+
+
+@contextmanager
+def _timed(tab, section):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(tab, section, (time.perf_counter() - start) * 1000)
+
+
+def span(tab, section):
+    """Context manager timing one section (no-op unless timings are enabled)"""
+    if not enabled():
+        return _NOOP
+    return _timed(tab, section)
+
+
+def summary():
+    """Latency percentiles and histogram bucket counts per section"""
+    registry = _registry()
+    with registry["lock"]:
+        snapshot = {key: list(samples) for key, samples in registry["samples"].items()}
+
+    rows = []
+    labels = [f"<{b}ms" for b in BUCKETS_MS] + [f"≥{BUCKETS_MS[-1]}ms"]
+    for (tab, section), samples in sorted(snapshot.items()):
+        values = pd.Series(samples)
+        counts = pd.cut(values, [0] + BUCKETS_MS + [float("inf")], labels=labels, right=False).value_counts(sort=False)
+        rows.append({
+            "Tab": tab,
+            "Section": section,
+            "Runs": len(values),
+            "Last (ms)": round(values.iloc[-1], 1),
+            "p50 (ms)": round(values.quantile(0.5), 1),
+            "p95 (ms)": round(values.quantile(0.95), 1),
+            "Max (ms)": round(values.max(), 1),
+            **counts.to_dict(),
+        })
+    return pd.DataFrame(rows)
+
+
+def render_debug_panel():
+    """Opt-in sidebar panel, offered when the app is opened with ?debug=1"""
+    if st.query_params.get("debug") != "1" and "perf_panel" not in st.session_state:
+        return
+    with st.sidebar:
+        st.toggle("⏱️ Performance panel", key="perf_panel")
+        if not st.session_state.get("perf_panel"):
+            return
+        table = summary()
+        if table.empty:
+            st.caption("No timings yet — interact with a tab to collect samples.")
+            return
+        st.caption(f"Rolling window of the last {WINDOW} runs per section (all sessions)")
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        if st.button("Reset timings"):
+            registry = _registry()
+            with registry["lock"]:
+                registry["samples"].clear()
@@ -0,0 +1,81 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_store import load_dataset
+from perf import record
+import cache_utils  # noqa: F401  (registers the Summary sheet with the watcher)
+import survey_data  # noqa: F401  (registers the survey workbooks with the watcher)
+import watcher
+
+# -----------------------------
+# Concurrent cold start
+# -----------------------------
+# The first run in a server process reads every registered source workbook
+# at once on a bounded pool instead of one after another: each worker
+# fingerprints its workbook (converting it to the columnar cache when it
+# is new) and publishes that snapshot.  The registered caches (dataset,
+# Summary sheet, survey aggregates) are then built concurrently from those
+# same published fingerprints, so they all describe one consistent snapshot
+# of the sources and a cold start takes about as long as the slowest
+# workbook.  Per-file times are recorded as "startup / Read <file>" spans.
+
+WORKERS = int(os.environ.get("ACJ_LOAD_WORKERS", "4"))
+
+logger = logging.getLogger("acj.startup")
+
+_timings = {}
+_lock = threading.Lock()
+_done = False
+
+
+def _read(path):
+    start = time.perf_counter()
+    watcher.fingerprint(path)
+    return (time.perf_counter() - start) * 1000
+
+
+def _build(rebuild):
+    start = time.perf_counter()
+    rebuild()
+    return (time.perf_counter() - start) * 1000
+
+
+def preload(max_workers=WORKERS):
+    """Read every source workbook, then build every registered cache, on a pool; returns {item: ms}"""
+    paths = watcher.sources()
+    builds = watcher.dependents()
+    timings = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="acj-load") as pool:
+        reads = {os.path.basename(path): pool.submit(_read, path) for path in paths}
+        for name, future in reads.items():
+            timings[f"Read {name}"] = future.result()
+        built = {name: pool.submit(_build, rebuild) for name, rebuild in builds.items()}
+        for name, future in built.items():
+            timings[f"Build {name}"] = future.result()
+
+    for item, ms in timings.items():
+        record("startup", item, ms)
+        logger.info("%s: %.0f ms", item, ms)
+    return timings
+
+
+def load():
+    """The shared dataset; the first call in a process preloads every source concurrently"""
+    global _done
+    if not _done:
+        with _lock:
+            if not _done:
+                start = time.perf_counter()
+                _timings.update(preload())
+                _timings["Total"] = (time.perf_counter() - start) * 1000
+                record("startup", "Total", _timings["Total"])
+                _done = True
+    return load_dataset()
+
+
+def timings():
+    """Wall time (ms) of each read and build of the last preload, plus the total"""
+    return dict(_timings)
@@ -0,0 +1,150 @@
+import streamlit as st
+import pandas as pd
+from excel_cache import data_path, read_excel
+from figure_cache import evict_version
+import watcher
+
+ENGAGEMENT_FILE = data_path("Emp Engagement.xlsx")
+PARTICIPATION_FILE = data_path("Participation.xlsx")
+
+RATING_COLUMNS = ["Outstanding", "Average", "Needs Improvement"]
+
+EMPTY_METRICS = {
+    "engagement_score": 0,
+    "top_dimension": "N/A",
+    "top_dimension_score": 0,
+    "needs_improvement_count": 0,
+    "yoy_change": 0,
+    "participation_rate": 0,
+}
+
+
+def _read_survey_sheet(path):
+    """Read a survey workbook and parse its Calendar Year"""
+    frame = read_excel(path, sheet_name="Sheet1")
+    frame.columns = frame.columns.str.strip()
+    frame["Calendar Year"] = pd.to_datetime(frame["Calendar Year"], errors="coerce")
+    frame["Year"] = frame["Calendar Year"].dt.year
+    return frame
+
+
+def _engagement_score(frame):
+    """Weighted engagement score (Outstanding=100, Average=50, Needs Improvement=0)"""
+    outstanding = frame["Outstanding"].mean() * 100
+    average = frame["Average"].mean() * 100
+    needs_improvement = frame["Needs Improvement"].mean() * 100
+    return (outstanding + (average * 0.5)) / (outstanding + average + needs_improvement) * 100
+
+
+def _build_yoy_table(df_engagement):
+    """Engagement score per year with the change against the previous year"""
+    scores = {int(year): _engagement_score(group) for year, group in df_engagement.dropna(subset=["Year"]).groupby("Year")}
+    yoy = pd.DataFrame({"Year": list(scores), "Engagement Score": list(scores.values())}).sort_values("Year")
+    previous = yoy["Year"].map(lambda y: scores.get(y - 1))
+    yoy["Previous Score"] = previous
+    yoy["YoY Change"] = (yoy["Engagement Score"] - previous).fillna(0)
+    return yoy.reset_index(drop=True)
+
+
+@st.cache_data(max_entries=2)
+def _load_survey_data(engagement_file, participation_file, fingerprints):
+    """Load, normalize and pre-aggregate both survey sources (fingerprints key the cache entry)"""
+    df_engagement = _read_survey_sheet(engagement_file)
+    df_participation = _read_survey_sheet(participation_file)
+
+    # Long table for the stacked ratings chart
+    df_long = df_engagement.melt(
+        id_vars=["Dimensions", "Year"],
+        value_vars=RATING_COLUMNS,
+        var_name="Rating Type",
+        value_name="Score"
+    )
+    df_long["Score %"] = df_long["Score"] * 100
+
+    yoy = _build_yoy_table(df_engagement)
+    yoy_by_year = yoy.set_index("Year")["YoY Change"].to_dict()
+    participation_by_year = (
+        df_participation.dropna(subset=["Year"])
+        .drop_duplicates(subset=["Year"], keep="first")
+        .set_index("Year")["Participation Rate"]
+        .to_dict()
+    )
+
+    metrics = {}
+    pivots = {}
+    for year, engagement_year in df_engagement.dropna(subset=["Year"]).groupby("Year"):
+        year = int(year)
+        scored = engagement_year.copy()
+        scored["Score"] = (scored["Outstanding"] * 100 + scored["Average"] * 50) / 150 * 100
+        top_dimension = scored.nlargest(1, "Score").iloc[0]
+
+        metrics[year] = {
+            "engagement_score": _engagement_score(engagement_year),
+            "top_dimension": top_dimension["Dimensions"],
+            "top_dimension_score": top_dimension["Score"],
+            "needs_improvement_count": int((scored["Score"] < 60).sum()),
+            "yoy_change": yoy_by_year.get(year, 0),
+        }
+        pivots[year] = (
+            df_long[df_long["Year"] == year]
+            .pivot(index="Dimensions", columns="Rating Type", values="Score %")
+            .fillna(0)
+        )
+
+    for year, rate in participation_by_year.items():
+        metrics.setdefault(int(year), dict(EMPTY_METRICS))["participation_rate"] = rate * 100
+
+    return {
+        "engagement": df_engagement,
+        "participation": df_participation,
+        "long": df_long,
+        "yoy": yoy,
+        "metrics": metrics,
+        "pivots": pivots,
+        # Data version for derived caches (figure_cache)
+        "version": _version(fingerprints),
+    }
+
+
+def _fingerprints(engagement_file, participation_file):
+    """Published fingerprints of the two survey sheets"""
+    return (watcher.fingerprint(engagement_file, "Sheet1"), watcher.fingerprint(participation_file, "Sheet1"))
+
+
+def _version(fingerprints):
+    return "-".join(fingerprint[:16] for fingerprint in fingerprints)
+
+
+def survey_version(engagement_file=ENGAGEMENT_FILE, participation_file=PARTICIPATION_FILE):
+    """Data version of the survey sources"""
+    return _version(_fingerprints(engagement_file, participation_file))
+
+
+def get_survey_data(engagement_file=ENGAGEMENT_FILE, participation_file=PARTICIPATION_FILE):
+    """Survey datasets and per-year aggregates, rebuilt only when either sheet changes"""
+    fingerprints = _fingerprints(engagement_file, participation_file)
+    return _load_survey_data(engagement_file, participation_file, fingerprints)
+
+
+def get_year_metrics(survey_data, year):
+    """KPI values for one year (zeros when the year has no survey data)"""
+    metrics = dict(EMPTY_METRICS)
+    metrics.update(survey_data["metrics"].get(int(year), {}))
+    return metrics
+
+
+def get_ratings_pivot(survey_data, year):
+    """Dimensions x rating-type percentages for one year"""
+    pivot = survey_data["pivots"].get(int(year))
+    if pivot is None:
+        return pd.DataFrame(columns=RATING_COLUMNS, dtype=float).rename_axis("Dimensions")
+    return pivot
+
+
+watcher.register(
+    "survey",
+    [(ENGAGEMENT_FILE, "Sheet1"), (PARTICIPATION_FILE, "Sheet1")],
+    version=survey_version,
+    rebuild=get_survey_data,
+    evict=evict_version,
+)
@@ -0,0 +1,357 @@
+"""Synthetic HR dataset generator for scale testing
+
+Writes the five source workbooks the dashboard reads, with the same file
+names, sheets and columns, plus a Parquet copy of every sheet.  A scale
+factor of 1 gives roughly the size of the real data (~920 starting
+employees, ~7,000 employee-year rows); 100 gives ~700,000 rows.  No real
+employee data is used: names, ages and ratings are all drawn at random.
+
+Usage:
+    python synth_data.py --scale 10 --out synthetic/x10
+    python synth_data.py --scale 100 --formats parquet      # xlsx is slow at this size
+    ACJ_DATA_DIR=synthetic/x10 streamlit run web_app.py     # point the app at it
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Same names the app reads (data_store / survey_data)
+EMPLOYEE_FILE = "HR Cleaned Data 01.09.26.xlsx"
+ANALYSIS_FILE = "HR_Analysis_Output.xlsx"
+ATTRITION_FILE = "Attrition-Vol and Invol.xlsx"
+ENGAGEMENT_FILE = "Emp Engagement.xlsx"
+PARTICIPATION_FILE = "Participation.xlsx"
+
+SURVEY_COLUMNS = [
+    "Corporate Culture", "Job Satisfaction", "Pay/Benefits", "Job Content and Design",
+    "Management", "Respect", "Innovation", "Career", "Work/Life", "Leadership",
+    "Communication", "Appraisals",
+]
+DATA_COLUMNS = [
+    "Calendar Year", "Full Name", "Age", "Position/Level", "Year Joined", "Gender",
+    "Resignee Checking", "Resignation Date", "Generation", "Tenure", "Promotion & Transfer",
+] + SURVEY_COLUMNS
+ENGAGEMENT_DIMENSIONS = [
+    "Appraisal", "Belonging", "Career Development", "Collaboration & Communication",
+    "Employee Engagement", "Innovation", "Management", "Pay/Benefits",
+    "Role Alignment & Support", "Wellbeing",
+]
+
+FIRST_NAMES = [
+    "Aira", "Andrea", "Angelo", "Bea", "Carlo", "Camille", "Dan", "Diana", "Enzo", "Erika",
+    "Francis", "Gabriel", "Grace", "Hannah", "Ian", "Isabel", "Jasmine", "John", "Joshua", "Julia",
+    "Karen", "Kevin", "Lara", "Leo", "Mae", "Mark", "Mia", "Miguel", "Nicole", "Noel",
+    "Patricia", "Paolo", "Queenie", "Rafael", "Rica", "Ryan", "Sofia", "Trisha", "Vince", "Yvonne",
+]
+LAST_NAMES = [
+    "Aguilar", "Bautista", "Castillo", "Cruz", "Dela Cruz", "Delos Reyes", "Domingo", "Fernandez",
+    "Flores", "Garcia", "Gonzales", "Hernandez", "Lopez", "Manalo", "Mendoza", "Morales",
+    "Navarro", "Ocampo", "Pascual", "Perez", "Ramos", "Reyes", "Rivera", "Robles",
+    "Salazar", "Santiago", "Santos", "Soriano", "Tolentino", "Torres", "Valdez", "Velasco",
+    "Villanueva", "Yap",
+]
+
+# -----------------------------
+# Population model
+# -----------------------------
+BASE_HEADCOUNT = 920      # starting employees at scale 1
+FIRST_COHORT = 2019       # join year of the starting population
+JOIN_RATE = (0.05, 0.25)  # yearly hires as a share of headcount
+LEAVE_RATE = 0.07         # baseline yearly resignation probability
+VOLUNTARY_SHARE = 0.2     # share of leavers recorded as Voluntary
+PROMOTION_RATE = 0.16
+MANAGER_SHARE = 0.2
+
+
+def _names(count, rng):
+    """Unique "First I. Last" names; a numeric suffix is added past the combinations available"""
+    combos = len(FIRST_NAMES) * 26 * len(LAST_NAMES)
+    order = rng.permutation(max(count, combos))[:count]
+    rounds, rest = np.divmod(order, combos)
+    first, rest = np.divmod(rest, 26 * len(LAST_NAMES))
+    initial, last = np.divmod(rest, len(LAST_NAMES))
+    return [
+        f"{FIRST_NAMES[f]} {chr(65 + i)}. {LAST_NAMES[l]}" + (f" {r + 1}" if r else "")
+        for f, i, l, r in zip(first, initial, last, rounds)
+    ]
+
+
+def _generation(birth_year):
+    return np.select(
+        [birth_year >= 1997, birth_year >= 1981, birth_year >= 1965],
+        ["Gen Z", "Millennial", "Gen X"],
+        default="Baby Boomer",
+    )
+
+
+def _hire(count, year, rng):
+    """Attributes of `count` new employees joining in `year`"""
+    age = np.clip(rng.normal(34, 9.5, count).round(), 18, 60).astype(int)
+    manager = rng.random(count) < np.clip((age - 22) / 60, 0.02, MANAGER_SHARE * 2)
+    return {
+        "join_year": np.full(count, year),
+        "birth_year": year - age,
+        "gender": np.where(rng.random(count) < 0.53, "Male", "Female"),
+        "manager": manager,
+        # Latent engagement: drives ratings, promotions and resignations
+        "engagement": rng.normal(0, 1, count),
+    }
+
+
+def simulate_employees(scale=1.0, years=range(2020, 2026), seed=42):
+    """Employee-year rows with the columns of the Data sheet"""
+    rng = np.random.default_rng(seed)
+    years = list(years)
+    staff = _hire(max(1, round(BASE_HEADCOUNT * scale)), FIRST_COHORT, rng)
+    staff["id"] = np.arange(len(staff["join_year"]))
+    next_id = len(staff["id"])
+    offsets = rng.normal(0, 0.35, len(SURVEY_COLUMNS))
+
+    frames = []
+    for year in years:
+        hires = int(len(staff["id"]) * rng.uniform(*JOIN_RATE))
+        new = _hire(hires, year, rng)
+        new["id"] = np.arange(next_id, next_id + hires)
+        next_id += hires
+        staff = {k: np.concatenate([staff[k], new[k]]) for k in staff}
+
+        n = len(staff["id"])
+        tenure = year - staff["join_year"]
+        engagement = staff["engagement"]
+        leave_p = LEAVE_RATE * np.exp(-0.45 * engagement) * np.where(tenure <= 1, 1.3, 1.0)
+        leaver = rng.random(n) < leave_p
+        promoted = rng.random(n) < PROMOTION_RATE * np.exp(0.5 * engagement) / 1.13
+
+        ratings = 3.6 + offsets + 0.6 * engagement[:, None] + rng.normal(0, 0.9, (n, len(SURVEY_COLUMNS)))
+        ratings = np.clip(ratings.round(), 1, 5).astype(int)
+        months = rng.integers(1, 13, n)
+
+        frame = pd.DataFrame({
+            "Calendar Year": pd.Timestamp(year=year, month=1, day=1),
+            "EmployeeId": staff["id"],
+            "Age": year - staff["birth_year"],
+            "Position/Level": np.where(staff["manager"], "Manager & Up", "Associate"),
+            "Year Joined": pd.to_datetime(staff["join_year"].astype(str), format="%Y"),
+            "Gender": staff["gender"],
+            "Resignee Checking": np.where(leaver, "LEAVER", "ACTIVE"),
+            "Resignation Date": pd.to_datetime(pd.DataFrame({"year": year, "month": months, "day": 1})).where(leaver),
+            "Generation": _generation(staff["birth_year"]),
+            "Tenure": tenure,
+            "Promotion & Transfer": promoted.astype(int),
+        })
+        frame = frame.join(pd.DataFrame(ratings, columns=SURVEY_COLUMNS))
+        frames.append(frame)
+
+        # Leavers are gone next year; some promoted associates become managers
+        staff["manager"] = staff["manager"] | (promoted & (rng.random(n) < 0.3))
+        staff = {k: v[~leaver] for k, v in staff.items()}
+
+    data = pd.concat(frames, ignore_index=True)
+    names = np.array(_names(next_id, rng), dtype=object)
+    data.insert(1, "Full Name", names[data.pop("EmployeeId").to_numpy()])
+    return data[DATA_COLUMNS]
+
+
+# -----------------------------
+# Derived sheets
+# -----------------------------
+def build_summary(data):
+    """Summary sheet: yearly headcount flow"""
+    year = data["Calendar Year"].dt.year
+    joined = data["Year Joined"].dt.year
+    rows = []
+    for y, group in data.groupby(year):
+        total = len(group)
+        joins = int((joined[group.index] == y).sum())
+        resignations = int((group["Resignee Checking"] == "LEAVER").sum())
+        start = total - joins
+        end = start + joins - resignations
+        rows.append({
+            "Year": y,
+            "Starting Headcount": start,
+            "Joins": joins,
+            "Resignations": resignations,
+            "Ending Headcount": end,
+            "Retention Rate (%)": (start - resignations) / start * 100 if start else 0.0,
+            "Attrition Rate(%)": resignations / ((start + end) / 2) * 100 if start + end else 0.0,
+            "Net Change": joins - resignations,
+        })
+    return pd.DataFrame(rows)
+
+
+def _with_keys(data):
+    frame = data.copy()
+    frame["Year"] = frame["Calendar Year"].dt.year
+    frame["YearJoined"] = frame["Year Joined"].dt.year
+    frame["Active"] = frame["Resignee Checking"] == "ACTIVE"
+    return frame
+
+
+def _counts(frame, by, name="Count"):
+    return frame.groupby(by).size().reset_index(name=name)
+
+
+def _correlations(frame, flag, column):
+    rows = []
+    for y, group in frame.groupby("Year"):
+        corr = group[SURVEY_COLUMNS].corrwith(group[flag].astype(float))
+        rows.append(pd.DataFrame({"Category": SURVEY_COLUMNS, column: corr.to_numpy(), "Year": y}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def build_analysis_output(data):
+    """Every sheet of HR_Analysis_Output.xlsx, computed from the Data sheet"""
+    frame = _with_keys(data)
+    active = frame[frame["Active"]]
+    headcount = _counts(active, ["Year"], "Headcount")
+
+    def per_year(table):
+        return table.merge(headcount, on="Year", how="left")
+
+    sheets = {}
+    sheets["Age Distribution"] = per_year(_counts(active, ["Year", "Age", "Generation"]))
+    sheets["Generation Distribution"] = per_year(_counts(active, ["Year", "Generation"]))
+    sheets["Gender Diversity"] = per_year(_counts(active, ["Year", "Gender", "Position/Level"]))
+    sheets["Tenure Analysis"] = per_year(_counts(active, ["Year", "YearJoined", "Tenure"]))
+
+    trends = per_year(_counts(frame[~frame["Active"]], ["Year", "YearJoined", "Tenure"], "LeaverCount"))
+    trends["AttritionRate"] = trends["LeaverCount"] / trends["Headcount"] * 100
+    sheets["Resignation Trends"] = trends
+
+    cohort_size = frame.groupby("YearJoined")["Full Name"].nunique().rename("CohortSize")
+    names = frame[["YearJoined", "Generation", "Position/Level", "Full Name"]].drop_duplicates()
+    sheets["Retention by Cohort (Names)"] = names.join(cohort_size, on="YearJoined").reset_index(drop=True)
+
+    last_year = frame["Year"].max()
+    retained = frame[(frame["Year"] == last_year) & frame["Active"]]
+    cohorts = _counts(retained, ["YearJoined", "Generation", "Position/Level"], "RetainedCount")
+    cohorts = cohorts.join(cohort_size, on="YearJoined")
+    cohorts["RetentionRate"] = cohorts["RetainedCount"] / cohorts["CohortSize"] * 100
+    sheets["Retention by Cohort (Summary)"] = cohorts
+
+    promoted = per_year(_counts(active[active["Promotion & Transfer"] == 1], ["Year", "Position/Level", "Tenure"]))
+    promoted["Rate"] = promoted["Count"] / promoted["Headcount"] * 100
+    sheets["Promotion & Transfer"] = promoted
+
+    repeat = frame[frame.duplicated("Full Name", keep=False)].sort_values(["Full Name", "Year"])
+    sheets["Duplicate Names by Cohort"] = (
+        repeat[DATA_COLUMNS + ["Year", "YearJoined"]]
+        .rename(columns={"Resignee Checking": "Resignee Checking "})
+        .reset_index(drop=True)
+    )
+
+    sheets["Headcount Per Year"] = headcount
+    by_year = frame.groupby("Year")[SURVEY_COLUMNS]
+    sheets["Satisfaction Prct"] = by_year.mean().reset_index()
+    sheets["Satisfaction Count"] = by_year.count().reset_index()
+    frame["Engagement Score"] = frame[SURVEY_COLUMNS].mean(axis=1)
+    sheets["Engagement Index"] = frame.groupby("Year")["Engagement Score"].mean().reset_index()
+
+    frame["Resigned"] = ~frame["Active"]
+    sheets["Driver-Resignation"] = _correlations(frame, "Resigned", "Correlation with Resignation")
+    sheets["Driver-Promotion"] = _correlations(frame, "Promotion & Transfer", "Correlation with Promotion")
+    sheets["Promotion Predictors"] = sheets["Driver-Promotion"].rename(
+        columns={"Correlation with Promotion": "Promotion Predictor Strength"}
+    )
+
+    by_status = frame.rename(columns={"Resignee Checking": "Resignee Checking "}).groupby(["Year", "Resignee Checking "])
+    sheets["Engagement vs Retention"] = (
+        by_status["Engagement Score"].mean().rename("Avg Engagement Score").reset_index()
+    )
+    sheets["Satisfaction vs Retention"] = by_status[SURVEY_COLUMNS].mean().reset_index()
+    return sheets
+
+
+def build_attrition(data, rng):
+    """Status per employee-year, row-aligned with the Data sheet"""
+    leaver = data["Resignee Checking"] == "LEAVER"
+    kind = np.where(rng.random(len(data)) < VOLUNTARY_SHARE, "Voluntary", "Involuntary")
+    return pd.DataFrame({
+        "Calendar Year": data["Calendar Year"],
+        "Status": np.where(leaver, kind, "ACTIVE"),
+    })
+
+
+def build_engagement(years, rng):
+    """Emp Engagement sheet: rating shares per survey dimension and year"""
+    rows = []
+    for year in years:
+        for dimension in ENGAGEMENT_DIMENSIONS:
+            outstanding = round(float(np.clip(rng.normal(0.85, 0.04), 0.6, 0.97)), 2)
+            average = round((1 - outstanding) * float(rng.uniform(0.5, 0.85)), 2)
+            rows.append({
+                "Calendar Year": pd.Timestamp(year=year, month=1, day=1),
+                "Dimensions": dimension,
+                "Outstanding": outstanding,
+                "Average": average,
+                "Needs Improvement": round(1 - outstanding - average, 2),
+            })
+    return pd.DataFrame(rows)
+
+
+def build_participation(years, rng):
+    return pd.DataFrame({
+        "Calendar Year": [pd.Timestamp(year=y, month=1, day=1) for y in years],
+        "Participation Rate": rng.uniform(0.9, 0.99, len(years)).round(2),
+    })
+
+
+# -----------------------------
+# Output
+# -----------------------------
+def build_workbooks(scale=1.0, years=range(2020, 2026), seed=42):
+    """Every source workbook as {file name: {sheet name: frame}}"""
+    years = list(years)
+    rng = np.random.default_rng(seed + 1)
+    data = simulate_employees(scale, years, seed)
+    return {
+        EMPLOYEE_FILE: {"Data": data, "Summary": build_summary(data)},
+        ANALYSIS_FILE: build_analysis_output(data),
+        ATTRITION_FILE: {"Voluntary and Involuntary": build_attrition(data, rng)},
+        ENGAGEMENT_FILE: {"Sheet1": build_engagement(years, rng)},
+        PARTICIPATION_FILE: {"Sheet1": build_participation(years, rng)},
+    }
+
+
+def write_workbooks(workbooks, out_dir, formats=("xlsx", "parquet")):
+    """Write each workbook as xlsx and/or one Parquet file per sheet under parquet/<stem>/"""
+    os.makedirs(out_dir, exist_ok=True)
+    for file_name, sheets in workbooks.items():
+        start = time.perf_counter()
+        if "xlsx" in formats:
+            with pd.ExcelWriter(os.path.join(out_dir, file_name)) as writer:
+                for sheet_name, frame in sheets.items():
+                    frame.to_excel(writer, sheet_name=sheet_name, index=False)
+        if "parquet" in formats:
+            stem = os.path.splitext(file_name)[0].replace(" ", "_")
+            sheet_dir = os.path.join(out_dir, "parquet", stem)
+            os.makedirs(sheet_dir, exist_ok=True)
+            for sheet_name, frame in sheets.items():
+                frame.to_parquet(os.path.join(sheet_dir, f"{sheet_name}.parquet"), index=False)
+        rows = sum(len(frame) for frame in sheets.values())
+        print(f"  {file_name:<32} {len(sheets):>3} sheets {rows:>10,} rows  {time.perf_counter() - start:6.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of the real starting headcount")
+    parser.add_argument("--years", type=int, nargs=2, default=[2020, 2025], metavar=("FIRST", "LAST"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="output directory (default synthetic/x<scale>)")
+    parser.add_argument("--formats", nargs="+", choices=["xlsx", "parquet"], default=["xlsx", "parquet"])
+    args = parser.parse_args()
+
+    out_dir = args.out or os.path.join("synthetic", f"x{args.scale:g}")
+    years = range(args.years[0], args.years[1] + 1)
+    start = time.perf_counter()
+    workbooks = build_workbooks(args.scale, years, args.seed)
+    print(f"Generated {len(workbooks[EMPLOYEE_FILE]['Data']):,} employee-year rows "
+          f"in {time.perf_counter() - start:.1f}s; writing to {out_dir}")
+    write_workbooks(workbooks, out_dir, args.formats)
+
+
+if __name__ == "__main__":
+    main()
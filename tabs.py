@@ -0,0 +1,108 @@
+import importlib
+import sys
+import threading
+import time
+
+import streamlit as st
+from perf import record
+
+# -----------------------------
+# Lazily imported tab modules
+# -----------------------------
+# A tab's module (and with it Plotly, scikit-learn, ...) is imported the first
+# time the tab is opened in this server process rather than when web_app.py
+# starts, so a cold start only pays for the tab being shown.  The first
+# import of each module is recorded as an "app / Import <module>" span.
+
+# (label, module, year radio key or None)
+TABS = [
+    ("👥 Workforce", "workforce", "workforce_year"),
+    ("🔄 Attrition & Retention", "attrition_retention", "attrition_year"),
+    ("🎯 Career Progression", "career", "career_year"),
+    ("💬 Survey & Feedback", "survey", "survey_year"),
+    ("📚 About Us", "aboutus", None),
+]
+
+# Fallback year options; web_app publishes the dataset's years with set_years()
+YEARS = [2020, 2021, 2022, 2023, 2024, 2025]
+
+_import_ms = {}
+_lock = threading.Lock()
+
+
+def load(module_name):
+    """Tab module, imported on first use"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        if module_name not in _import_ms:
+            _import_ms[module_name] = (time.perf_counter() - start) * 1000
+            record("app", f"Import {module_name}", _import_ms[module_name])
+    return module
+
+
+def import_times():
+    """Wall time (ms) of the first import of each tab module loaded so far"""
+    return dict(_import_ms)
+
+
+# -----------------------------
+# Navigation
+# -----------------------------
+# The active tab and year live in session state and are mirrored to the
+# ?tab=<module>&year=<year> query parameters, so a refresh or a shared link
+# opens the same view.  Tab buttons switch through an on_click callback,
+# which runs before the script: one script run per click, no st.rerun().
+
+def _tab_from_url():
+    modules = [module for _, module, _ in TABS]
+    tab = st.query_params.get("tab")
+    return modules.index(tab) if tab in modules else 0
+
+
+def set_years(years):
+    """Year options for this session (the partition index of the loaded dataset)"""
+    st.session_state.years = list(years) or YEARS
+
+
+def _years():
+    return st.session_state.get("years", YEARS)
+
+
+def _year_from_url():
+    years = _years()
+    year = st.query_params.get("year", "")
+    return int(year) if year.isdigit() and int(year) in years else years[0]
+
+
+def active_tab():
+    """Index of the tab to render, taken from the URL on a session's first run"""
+    if "active_tab" not in st.session_state:
+        st.session_state.active_tab = _tab_from_url()
+    return st.session_state.active_tab
+
+
+def select_tab(idx):
+    """on_click callback of the tab buttons"""
+    st.session_state.active_tab = idx
+    _, module, year_key = TABS[idx]
+    st.query_params["tab"] = module
+    # A tab opened for the first time keeps the year from the URL
+    if year_key in st.session_state:
+        st.query_params["year"] = str(st.session_state[year_key])
+
+
+def _sync_year(key):
+    st.query_params["year"] = str(st.session_state[key])
+
+
+def select_year(key):
+    """Year radio of a tab; draw it inside the tab's year fragment so a change only reruns that fragment"""
+    years = _years()
+    # A reloaded dataset may no longer hold the year picked earlier
+    if st.session_state.get(key) not in years:
+        st.session_state[key] = _year_from_url()
+    return st.radio("Select Year", years, horizontal=True, key=key, on_change=_sync_year, args=(key,))
@@ -0,0 +1,31 @@
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(ROOT, "*.py"))]
+
+
+@pytest.fixture
+def fresh_modules(tmp_path, monkeypatch):
+    """The app's modules re-imported on first use, with an empty cache directory
+
+    Environment variables the modules read at import time can be set with
+    monkeypatch in the test before importing them.
+    """
+    import streamlit as st
+
+    monkeypatch.chdir(ROOT)
+    monkeypatch.syspath_prepend(ROOT)
+    monkeypatch.setenv("ACJ_CACHE_DIR", str(tmp_path / "cache"))
+    for name in MODULES:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield tmp_path
+    for name in MODULES:
+        sys.modules.pop(name, None)
+    st.cache_data.clear()
+    st.cache_resource.clear()
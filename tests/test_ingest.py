@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMPLOYEE_FILE = os.path.join(ROOT, "HR Cleaned Data 01.09.26.xlsx")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(EMPLOYEE_FILE), reason="employee workbook not present")
+
+
+def _edit(data):
+    """The Data sheet with five 2023 rows turned into leavers and one 2025 joiner added, plus those rows"""
+    year = data["Calendar Year"].dt.year
+    changed = data[year == 2023].head(5).copy()
+    changed["Resignee Checking"] = "LEAVER"
+    joiner = data[year == 2025].head(1).copy()
+    joiner["Full Name"] = "Delta T. Joiner"
+    joiner["Year Joined"] = pd.Timestamp("2025-01-01")
+    delta = pd.concat([changed, joiner], ignore_index=True)
+
+    edited = data.copy()
+    edited.loc[changed.index, "Resignee Checking"] = "LEAVER"
+    return pd.concat([edited, joiner], ignore_index=True), delta
+
+
+def _comparable(frame):
+    frame = frame.sort_values(["Year", "Full Name"]).reset_index(drop=True)
+    return frame.astype({col: object for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)})
+
+
+def _categoricals(frame):
+    return {col for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)}
+
+
+def test_delta_matches_full_rebuild(fresh_modules, monkeypatch):
+    delta_dir = fresh_modules / "deltas"
+    delta_dir.mkdir()
+    monkeypatch.setenv("ACJ_DELTA_DIR", str(delta_dir))
+
+    data = pd.read_excel(EMPLOYEE_FILE, sheet_name="Data")
+    edited, delta = _edit(data)
+    delta.to_excel(delta_dir / "2026-01.xlsx", sheet_name="Data", index=False)
+
+    import analysis_engine
+    import data_store
+    from cache_utils import CATEGORICAL_COLUMNS, SUMMARY_FILE, get_summary_table, normalize_raw_data
+    from hr_cube import count_cube
+    from partitions import partition_by_year
+
+    merged = data_store.load_employees()
+    rebuilt = partition_by_year(normalize_raw_data(edited))
+
+    # The canonical frame keeps its categoricals through the merge and the partition store
+    assert _categoricals(merged) == _categoricals(rebuilt) >= set(CATEGORICAL_COLUMNS) & set(rebuilt.columns)
+    pd.testing.assert_frame_equal(_comparable(merged), _comparable(rebuilt))
+    data_store._latest_employees.update(version=None, frame=None)
+    reloaded = data_store.load_employees()
+    assert _categoricals(reloaded) == _categoricals(rebuilt)
+    pd.testing.assert_frame_equal(_comparable(reloaded), _comparable(rebuilt))
+
+    # Per-year aggregates assembled from the merged years
+    assert _categoricals(count_cube(merged)) == _categoricals(count_cube(rebuilt))
+    merged_tables, rebuilt_tables = analysis_engine.analysis_tables(merged), analysis_engine.build_tables(rebuilt)
+    for sheet, table in rebuilt_tables.items():
+        assert _categoricals(merged_tables[sheet]) == _categoricals(table), sheet
+
+    # Summary rows of the changed years follow the employee rows
+    summary = get_summary_table(SUMMARY_FILE, merged).set_index("Year")
+    for year in [2023, 2025]:
+        rows = rebuilt[rebuilt["Year"] == year]
+        assert summary.loc[year, "Resignations"] == rows["ResignedFlag"].sum()
+        assert summary.loc[year, "Ending Headcount"] == (rows["ResignedFlag"] == 0).sum()
+    assert summary.loc[2024, "Starting Headcount"] == summary.loc[2023, "Ending Headcount"]
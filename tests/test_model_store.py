@@ -0,0 +1,19 @@
+import os
+
+
+def test_prune_keeps_current_and_recent_entries(fresh_modules):
+    import model_store
+
+    for i, key in enumerate(["old1", "old2", "old3", "cur1", "cur2"]):
+        model_store.save(key, {"n": i})
+        os.utime(model_store._path(key), (i, i))
+
+    assert model_store.prune({"cur1", "cur2"}, spare=1) == 2
+    assert sorted(os.path.splitext(name)[0] for name in os.listdir(model_store.MODEL_DIR)) == ["cur1", "cur2", "old3"]
+    assert model_store.load("cur1") == {"n": 3}
+
+
+def test_prune_without_store(fresh_modules):
+    import model_store
+
+    assert model_store.prune({"key"}) == 0
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANALYSIS_FILE = os.path.join(ROOT, "HR_Analysis_Output.xlsx")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(ANALYSIS_FILE), reason="HR_Analysis_Output.xlsx not present")
+
+
+@pytest.fixture
+def workbook_source(fresh_modules, monkeypatch):
+    """The app's modules re-imported with ACJ_ANALYSIS_SOURCE=workbook"""
+    monkeypatch.setenv("ACJ_ANALYSIS_SOURCE", "workbook")
+
+
+def test_read_columns_types_declared_numbers(workbook_source):
+    import pandas as pd
+    from data_store import ANALYSIS_NUMERIC, analysis_columns
+    from excel_cache import read_columns
+
+    for _ in range(2):  # streamed, then from the column cache
+        sheets = read_columns(ANALYSIS_FILE, analysis_columns(), ANALYSIS_NUMERIC)
+        age = sheets["Age Distribution"]
+        assert pd.api.types.is_numeric_dtype(age["Year"])
+        assert pd.api.types.is_numeric_dtype(age["Age"])
+        assert pd.api.types.is_numeric_dtype(age["Count"])
+
+    expected = pd.read_excel(ANALYSIS_FILE, sheet_name="Age Distribution")
+    expected = expected[pd.to_numeric(expected["Year"], errors="coerce").notna()]
+    assert len(age) == len(expected)
+    assert age["Age"].mean() == pytest.approx(expected["Age"].mean())
+
+
+def test_workforce_tab_renders_from_streamed_workbook(workbook_source):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "web_app.py"), default_timeout=600)
+    at.session_state["active_tab"] = 0
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+
+    radio = at.radio(key="workforce_year")
+    for year in radio.options:
+        radio.set_value(int(year))
+        at.run()
+        assert not at.exception, [e.value for e in at.exception]
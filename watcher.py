@@ -0,0 +1,263 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from excel_cache import directory_fingerprints, file_fingerprint, sheet_fingerprints
+
+# -----------------------------
+# Source workbook watcher
+# -----------------------------
+# Data caches key on the *published* fingerprint of the workbook sheets they
+# read (fingerprint(path, sheet)) and declare that dependency with
+# register().  A daemon thread polls the registered workbooks every
+# ACJ_WATCH_INTERVAL seconds (size + mtime; contents are only re-hashed when
+# those change).  When a workbook changes, the thread re-parses it, works
+# out which sheets actually changed and rebuilds only the caches reading
+# those sheets, with the new fingerprints visible to the rebuild alone.
+# Connected sessions keep hitting the previous entries meanwhile; the new
+# fingerprints are published once every rebuild has finished, and each
+# cache's evict() then drops what it held for the old version.  Since the
+# rebuild fills the new entry before evict() runs, the data caches behind a
+# registration are bounded with max_entries instead of cleared: version-keyed
+# ones hold the current and the previous version, the per-year ones (keyed
+# by year token) 64 year slices.
+#
+# With ACJ_DROP_DIR set, each poll first moves finished exports dropped in
+# that directory (named like a source workbook, unchanged since the previous
+# poll) over the source they replace, so HR can refresh the dashboard by
+# copying files into a folder.
+#
+# A registered source may also be a directory (a path without extension,
+# which need not exist yet): its fingerprint covers the workbooks in it and
+# its "sheets" are those workbooks, so adding, changing or removing one
+# counts as a change (see members()).
+
+INTERVAL = float(os.environ.get("ACJ_WATCH_INTERVAL", "5"))  # seconds; 0 disables
+DROP_DIR = os.environ.get("ACJ_DROP_DIR", "")
+
+logger = logging.getLogger("acj.watcher")
+
+_published = {}     # abspath -> {"file": digest, "sheets": {name: fingerprint}}
+_dependents = {}    # name -> {"sources": [(abspath, sheet)], "version", "rebuild", "evict"}
+_lock = threading.RLock()
+_preview = threading.local()
+_thread = None
+_drops_seen = {}    # dropped file -> (size, mtime_ns) at the previous poll
+
+
+def _is_dir(path):
+    return os.path.isdir(path) or not os.path.splitext(path)[1]
+
+
+def _digest(path):
+    if _is_dir(path):
+        return hashlib.sha256(json.dumps(directory_fingerprints(path), sort_keys=True).encode()).hexdigest()
+    return file_fingerprint(path)
+
+
+def _snapshot(path):
+    if _is_dir(path):
+        members = directory_fingerprints(path)
+        modified = max((os.path.getmtime(os.path.join(path, name)) for name in members), default=0.0)
+    else:
+        members = sheet_fingerprints(path)
+        modified = os.path.getmtime(path)
+    return {"file": _digest(path), "sheets": members, "modified": modified, "published": time.time()}
+
+
+def _current(path):
+    key = os.path.abspath(path)
+    pending = getattr(_preview, "snapshots", {})
+    if key in pending:
+        return pending[key]
+    with _lock:
+        if key in _published:
+            return _published[key]
+    # Computed outside the lock so several workbooks can be parsed at once;
+    # the first snapshot stored for a path wins
+    snapshot = _snapshot(path)
+    with _lock:
+        return _published.setdefault(key, snapshot)
+
+
+def fingerprint(path, sheet=None):
+    """Published fingerprint of a workbook, or of one sheet (by name or position)"""
+    snapshot = _current(path)
+    if sheet is None:
+        return snapshot["file"]
+    sheets = snapshot["sheets"]
+    if isinstance(sheet, int):
+        sheet = list(sheets)[sheet]
+    return sheets.get(sheet, snapshot["file"])
+
+
+def members(path):
+    """Published {workbook name: fingerprint} of a registered directory"""
+    return dict(_current(path)["sheets"])
+
+
+def register(name, sources, version, rebuild, evict=None):
+    """Declare cache `name` as reading `sources` ([(path, sheet or None)])
+
+    version() returns the cache's current key, rebuild() warms the entry for
+    the fingerprints being published, and evict(old_version) drops what the
+    cache held for the previous one.
+    """
+    with _lock:
+        _dependents[name] = {
+            "sources": [(os.path.abspath(path), sheet) for path, sheet in sources],
+            "version": version,
+            "rebuild": rebuild,
+            "evict": evict,
+        }
+
+
+def sources():
+    """Every workbook a registered cache reads"""
+    with _lock:
+        return sorted({source for dep in _dependents.values() for source, _ in dep["sources"]})
+
+
+def dependents():
+    """{name: rebuild} of the registered caches"""
+    with _lock:
+        return {name: dep["rebuild"] for name, dep in _dependents.items()}
+
+
+def _changed_sheets(old, new):
+    names = set(old["sheets"]) | set(new["sheets"])
+    return {name for name in names if old["sheets"].get(name) != new["sheets"].get(name)}
+
+
+def _affected(path, changed, order):
+    """Dependents reading a changed sheet of `path`"""
+    affected = []
+    for name, dep in _dependents.items():
+        for source, sheet in dep["sources"]:
+            if source != path:
+                continue
+            if isinstance(sheet, int):
+                sheet = order[sheet] if sheet < len(order) else None
+            if sheet is None or sheet in changed:
+                affected.append(name)
+                break
+    return affected
+
+
+def check():
+    """Rebuild and publish every registered workbook that changed on disk; returns the rebuilt cache names"""
+    with _lock:
+        paths = {source for dep in _dependents.values() for source, _ in dep["sources"]}
+        published = {path: _published.get(path) for path in paths}
+
+    snapshots, affected = {}, []
+    for path, old in published.items():
+        if old is None or not (_is_dir(path) or os.path.exists(path)) or _digest(path) == old["file"]:
+            continue
+        new = _snapshot(path)
+        snapshots[path] = new
+        changed = _changed_sheets(old, new)
+        affected += [name for name in _affected(path, changed, list(new["sheets"])) if name not in affected]
+        logger.info("%s changed (sheets: %s)", os.path.basename(path), ", ".join(sorted(changed)) or "none")
+    if not snapshots:
+        return []
+
+    old_versions = {name: _dependents[name]["version"]() for name in affected}
+    _preview.snapshots = snapshots
+    try:
+        for name in affected:
+            start = time.perf_counter()
+            _dependents[name]["rebuild"]()
+            logger.info("rebuilt %s in %.0f ms", name, (time.perf_counter() - start) * 1000)
+    finally:
+        _preview.snapshots = {}
+
+    with _lock:
+        published_at = time.time()
+        for snapshot in snapshots.values():
+            snapshot["published"] = published_at
+        _published.update(snapshots)
+    for name in affected:
+        evict = _dependents[name]["evict"]
+        if evict is not None and _dependents[name]["version"]() != old_versions[name]:
+            evict(old_versions[name])
+    return affected
+
+
+def ingest_drops(drop_dir=DROP_DIR):
+    """Move finished exports from the drop directory over the sources they are named after"""
+    if not drop_dir or not os.path.isdir(drop_dir):
+        return []
+    with _lock:
+        targets = {
+            os.path.basename(source): source
+            for dep in _dependents.values() for source, _ in dep["sources"] if not _is_dir(source)
+        }
+
+    moved = []
+    for name in sorted(os.listdir(drop_dir)):
+        if name not in targets:
+            continue
+        dropped = os.path.join(drop_dir, name)
+        st_ = os.stat(dropped)
+        signature = (st_.st_size, st_.st_mtime_ns)
+        # A file still being copied changes between polls; wait until it settles
+        if _drops_seen.get(dropped) != signature:
+            _drops_seen[dropped] = signature
+            continue
+        del _drops_seen[dropped]
+
+        target = targets[name]
+        incoming = target + ".incoming"
+        shutil.copy2(dropped, incoming)
+        os.replace(incoming, target)
+        os.remove(dropped)
+        moved.append(target)
+        logger.info("installed %s from %s", name, drop_dir)
+    return moved
+
+
+def status():
+    """Per published workbook: file modification time and when this process published it"""
+    with _lock:
+        return {
+            os.path.basename(path): {"modified": snapshot["modified"], "published": snapshot["published"]}
+            for path, snapshot in _published.items()
+        }
+
+
+def data_as_of():
+    """(newest source modification time, latest publish time) as timestamps, or None before the first load"""
+    current = status()
+    if not current:
+        return None
+    return (
+        max(entry["modified"] for entry in current.values()),
+        max(entry["published"] for entry in current.values()),
+    )
+
+
+def _run(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            ingest_drops()
+            check()
+        except Exception:
+            # A half-written export is picked up again on the next poll
+            logger.exception("source refresh failed")
+
+
+def start(interval=INTERVAL):
+    """Start the polling thread once per process"""
+    global _thread
+    if interval <= 0:
+        return
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, args=(interval,), name="acj-watcher", daemon=True)
+            _thread.start()
@@ -1,12 +1,11 @@
-import streamlit as st
-import pandas as pd
+import time
 
-# Import tab modules
-import workforce
-import attrition_retention as attrition
-import career
-import survey
-import aboutus
+import streamlit as st
+from driver_analysis import start_warmup
+from perf import span, render_debug_panel
+from startup import load as load_dataset
+from tabs import TABS, active_tab, select_tab, set_years, load as load_tab
+from watcher import data_as_of, start as start_watcher
 
 # -----------------------------
 # Page configuration
@@ -24,37 +23,46 @@ with open("styles.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
 # -----------------------------
-# Load Excel outputs with caching
+# Load data once per server process
+# (shared read-only frames; each session gets zero-copy views; the first
+# run reads every source workbook concurrently, see startup.py)
 # -----------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_excel("HR_Analysis_Output.xlsx", sheet_name=None)
-    df_raw = pd.read_excel("HR Cleaned Data 01.09.26.xlsx", sheet_name="Data")
-    df_attrition = pd.read_excel("Attrition-Vol and Invol.xlsx")
-    return df, df_raw, df_attrition
-
-# Load data once using cache
-df, df_raw, df_attrition = load_data()
+with span("app", "Data load"):
+    data = load_dataset()
+df, df_raw, df_attrition, cube = data.analysis, data.employees, data.attrition, data.cube
+# Year options come from the employee data's partition index
+set_years(data.years)
 
 # -----------------------------
-# Ensure Year column exists
+# Rebuild data caches in the background when a source workbook changes
+# (sessions keep the current data until the rebuild is done)
 # -----------------------------
-if "Year" not in df_raw.columns and "Calendar Year" in df_raw.columns:
-    df_raw["Year"] = pd.to_datetime(df_raw["Calendar Year"]).dt.year
+start_watcher()
 
-if "Year" not in df_attrition.columns and "Calendar Year" in df_attrition.columns:
-    df_attrition["Year"] = pd.to_datetime(df_attrition["Calendar Year"]).dt.year
+# -----------------------------
+# Fit driver-analysis models for every year in the background
+# -----------------------------
+start_warmup(df_raw, data.years)
 
 # -----------------------------
 # App Title
 # -----------------------------
 st.title("ACJ Company Dashboard")
 
+# When the data being shown was exported, and when this server last swapped it in
+as_of = data_as_of()
+if as_of is not None:
+    modified, published = as_of
+    st.caption(f"Data as of {time.strftime('%Y-%m-%d %H:%M', time.localtime(modified))} · "
+               f"refreshed {time.strftime('%Y-%m-%d %H:%M', time.localtime(published))}")
+
+# Opt-in timing panel (open the app with ?debug=1)
+render_debug_panel()
+
 # -----------------------------
-# Initialize session state for active tab
+# Active tab (from the ?tab= query parameter on first load)
 # -----------------------------
-if "active_tab" not in st.session_state:
-    st.session_state.active_tab = 0
+current_tab = active_tab()
 
 # -----------------------------
 # Custom CSS for tab buttons
@@ -103,49 +111,39 @@ st.markdown("""
 # -----------------------------
 # Tab navigation with buttons
 # -----------------------------
-tab_names = [
-    "👥 Workforce",
-    "🔄 Attrition & Retention",
-    "🎯 Career Progression",
-    "💬 Survey & Feedback",
-    "📚 About Us"
-]
+# Tab modules are imported on first selection (see tabs.py)
+tab_names = [label for label, _, _ in TABS]
 
 # Create tab buttons
 tab_cols = st.columns(len(tab_names))
 for idx, (col, name) in enumerate(zip(tab_cols, tab_names)):
     # Highlight active tab
-    button_type = "primary" if st.session_state.active_tab == idx else "secondary"
-    if col.button(name, key=f"tab_{idx}", use_container_width=True, type=button_type):
-        st.session_state.active_tab = idx
-        st.rerun()
+    button_type = "primary" if current_tab == idx else "secondary"
+    col.button(name, key=f"tab_{idx}", use_container_width=True, type=button_type,
+               on_click=select_tab, args=(idx,))
 
 st.markdown("---")
 
 # -----------------------------
 # Render content based on active tab
 # -----------------------------
-active_tab = st.session_state.active_tab
-
-if active_tab == 0:  # Workforce
-    years = [2020, 2021, 2022, 2023, 2024, 2025]
-    selected_year = st.radio("Select Year", years, horizontal=True, key="workforce_year")
-    workforce.render(df, df_raw, selected_year)
+# Each tab draws its own year radio inside a st.fragment, so changing the
+# year reruns only that tab's year-dependent sections, not this script
+if current_tab == 0:  # Workforce
+    with span("workforce", "Render total"):
+        load_tab("workforce").render(df, df_raw, cube=cube)
 
-elif active_tab == 1:  # Attrition & Retention
-    years = [2020, 2021, 2022, 2023, 2024, 2025]
-    selected_year = st.radio("Select Year", years, horizontal=True, key="attrition_year")
-    attrition.render(df, df_raw, selected_year, df_attrition)
+elif current_tab == 1:  # Attrition & Retention
+    with span("attrition", "Render total"):
+        load_tab("attrition_retention").render(df, df_raw, df_attrition, cube=cube)
 
-elif active_tab == 2:  # Career Progression
-    years = [2020, 2021, 2022, 2023, 2024, 2025]
-    selected_year = st.radio("Select Year", years, horizontal=True, key="career_year")
-    career.render(df, df_raw, selected_year)
+elif current_tab == 2:  # Career Progression
+    with span("career", "Render total"):
+        load_tab("career").render(df, df_raw, cube=cube)
 
-elif active_tab == 3:  # Survey & Feedback
-    years = [2020, 2021, 2022, 2023, 2024, 2025]
-    selected_year = st.radio("Select Year", years, horizontal=True, key="survey_year")
-    survey.render(df, df_raw, selected_year)
+elif current_tab == 3:  # Survey & Feedback
+    with span("survey", "Render total"):
+        load_tab("survey").render(df, df_raw)
 
-elif active_tab == 4:  # About Us
-    aboutus.render(df, df_raw, 2024)
+elif current_tab == 4:  # About Us
+    load_tab("aboutus").render(df, df_raw, 2024)